@@ -0,0 +1,47 @@
+"""
+ConfigParser benchmarks: compile time as a function of config size and placeholder depth.
+
+Usage:
+    python -m benchmarks.bench_config --leaves 100 1000 5000 --depths 1 4 16
+"""
+import argparse
+
+from slurmflow.config import ConfigParser
+from benchmarks import harness
+from benchmarks.workloads import build_config
+
+
+def bench_compile(n_leaves: int, depth: int, repeat: int) -> dict:
+    config = ConfigParser(build_config(n_leaves, depth))
+    seconds = harness.time_best(config.compile, repeat)
+    return {"seconds": seconds, "leaves_per_second": (n_leaves + depth + 1) / seconds}
+
+
+def run(args) -> list:
+    harness.quiet_package_logger()
+    results = []
+    for n_leaves in args.leaves:
+        for depth in args.depths:
+            params = {"leaves": n_leaves, "depth": depth}
+            results.append(harness.record("config", "compile", params, bench_compile(n_leaves, depth, args.repeat)))
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--leaves", type=int, nargs="+", default=[100, 1000, 5000], help="Config sizes (leaf count).")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 4, 16], help="Placeholder chain depths.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/config-<timestamp>.json).")
+    args = parser.parse_args()
+    results = run(args)
+    harness.print_results(results)
+    print(f"Results written to {harness.write_results(results, args.output, name='config')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+SlurmDriver benchmarks against the fake Slurm binaries.
+
+Cases:
+    submit:    submission throughput for 1k to 100k jobs at a simulated sbatch latency.
+               Every submission runs one sbatch process, so a sweep costs about one
+               interpreter start-up per job with the Python fake (roughly 1-2 hours
+               for 100k jobs). The default sizes stop at 10k; pass 100000 explicitly.
+    placement: submission throughput with a PartitionPlacement policy at the smallest
+               submit size, and how many sinfo/squeue snapshots it took for the whole sweep.
+    poll:      cost of one check_job_status call, a list_jobs call and a refresh_registry
+               over the tracked jobs, with a queue of the given size. By default every job
+               in the queue is tracked, so refresh_registry polls 1k to 100k jobs in
+               batches of squeue/sacct calls.
+    follow:    cost of one LogFollower poll that picks up one new line per job, compared
+               with re-reading every log file in full.
+
+Usage:
+    python -m benchmarks.bench_driver --submit-jobs 1000 10000 100000 --queue-sizes 1000 10000 100000
+"""
+import os
+import argparse
+import tempfile
+
+from typing import Optional
+
+from slurmflow import metrics
+from slurmflow.driver import SlurmDriver, PartitionPlacement
+from slurmflow.follower import LogFollower
+from benchmarks import harness
+
+
+def bench_submit(n_jobs: int, latency: float, placement: PartitionPlacement = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir, harness.fake_slurm(tmpdir, latency=latency, pending=3600):
+        driver = SlurmDriver(placement=placement)
+        output_dir = os.path.join(tmpdir, "logs")
+
+        def submit_all():
+            for i in range(n_jobs):
+                driver.submit_job("true", slurm_args={"job_name": f"bench_{i}", "output_dir": output_dir})
+
+        seconds = harness.time_best(submit_all, repeat=1)
+        for job in driver.jobs_registry.values():
+            os.remove(job["script"])
+    return {"seconds": seconds, "jobs_per_second": n_jobs / seconds}
+
+
+def bench_poll(queue_size: int, tracked: Optional[int], repeat: int) -> dict:
+    fake_slurm = harness.fake_slurm_module()
+    with tempfile.TemporaryDirectory() as tmpdir, harness.fake_slurm(tmpdir):
+        job_ids = fake_slurm.seed(tmpdir, queue_size, pending=3600)
+        driver = SlurmDriver()
+        for job_id in job_ids[:tracked or queue_size]:
+            driver.jobs_registry[str(job_id)] = {"status": "submitted", "script": None}
+        first = str(job_ids[0])
+        return {
+            "check_job_status_seconds": harness.time_best(lambda: driver.check_job_status(first), repeat),
+            "list_jobs_seconds": harness.time_best(driver.list_jobs, repeat),
+            "refresh_registry_seconds": harness.time_best(driver.refresh_registry, repeat),
+        }
+
+
+def bench_follow(n_jobs: int, log_kb: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir, harness.fake_slurm(tmpdir):
+        driver = SlurmDriver()
+        line = b"x" * 99 + b"\n"
+        for i in range(n_jobs):
+            path = os.path.join(tmpdir, f"slurm_job{i}.out")
+            with open(path, "wb") as file:
+                file.write(line * (log_kb * 1024 // len(line)))
+            driver.jobs_registry[str(i)] = {"status": "running", "script": None, "output": path}
+        follower = LogFollower(driver, streams=("out",), use_inotify=False)
+        follower.poll()
+
+        def append_and_poll():
+            for job in driver.jobs_registry.values():
+                with open(job["output"], "ab") as file:
+                    file.write(line)
+            follower.poll()
+
+        def append_and_reread():
+            for job in driver.jobs_registry.values():
+                with open(job["output"], "ab") as file:
+                    file.write(line)
+            for job in driver.jobs_registry.values():
+                with open(job["output"], "rb") as file:
+                    file.read().splitlines()
+
+        return {
+            "incremental_seconds": harness.time_best(append_and_poll, repeat),
+            "full_reread_seconds": harness.time_best(append_and_reread, repeat),
+        }
+
+
+def run(args) -> list:
+    harness.quiet_package_logger()
+    results = []
+    for n_jobs in args.submit_jobs:
+        params = {"n_jobs": n_jobs, "latency": args.latency}
+        results.append(harness.record("driver", "submit", params, bench_submit(n_jobs, args.latency)))
+
+    was_enabled = metrics.is_enabled()
+    metrics.enable()
+    metrics.reset()
+    placement = PartitionPlacement(["standard", "gpu"], ttl=args.placement_ttl)
+    n_jobs = min(args.submit_jobs)
+    placement_metrics = bench_submit(n_jobs, args.latency, placement)
+    placement_metrics["snapshots"] = sum(
+        c["value"] for c in metrics.registry.snapshot()["counters"] if c["name"] == "driver.placement_snapshots"
+    )
+    if not was_enabled:
+        metrics.disable()
+    params = {"n_jobs": n_jobs, "latency": args.latency, "ttl": args.placement_ttl}
+    results.append(harness.record("driver", "placement", params, placement_metrics))
+    for queue_size in args.queue_sizes:
+        params = {"queue_size": queue_size, "tracked": args.tracked or queue_size}
+        results.append(harness.record("driver", "poll", params, bench_poll(queue_size, args.tracked, args.repeat)))
+    params = {"jobs": args.follow_jobs, "log_kb": args.follow_log_kb}
+    results.append(harness.record("driver", "follow", params,
+                                  bench_follow(args.follow_jobs, args.follow_log_kb, args.repeat)))
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--submit-jobs", type=int, nargs="+", default=[1000, 10000],
+                        help="Numbers of jobs submitted in the throughput case.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency of each Slurm command (s).")
+    parser.add_argument("--placement-ttl", type=float, default=30.0, help="Snapshot TTL of the placement case (s).")
+    parser.add_argument("--queue-sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Queue sizes for the polling case.")
+    parser.add_argument("--follow-jobs", type=int, default=500, help="Jobs whose logs are followed.")
+    parser.add_argument("--follow-log-kb", type=int, default=256, help="Size of each followed log file (KB).")
+    parser.add_argument("--tracked", type=int, default=None,
+                        help="Jobs in the driver registry when polling (default: every job in the queue).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/driver-<timestamp>.json).")
+    args = parser.parse_args()
+    results = run(args)
+    harness.print_results(results)
+    print(f"Results written to {harness.write_results(results, args.output, name='driver')}")
+
+
+if __name__ == "__main__":
+    main()
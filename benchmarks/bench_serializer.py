@@ -0,0 +1,93 @@
+"""
+ObjectSerializer benchmarks: save/load throughput and peak RSS.
+
+Each case runs in a freshly spawned process so that its peak RSS is not polluted by the
+previous ones.
+
+Cases:
+    array:  one large numpy array.
+    deep:   an object graph of chains of nested objects.
+    leaves: one object with many small attributes.
+
+Usage:
+    python -m benchmarks.bench_serializer --array-mb 256 --nodes 20000 --fields 20000
+"""
+import os
+import argparse
+import tempfile
+
+from benchmarks import harness
+
+
+def _save_load(obj, payload_bytes: int, repeat: int) -> dict:
+    from slurmflow.serializer import ObjectSerializer
+
+    serializer = ObjectSerializer()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "bench.h5")
+        save_seconds = harness.time_best(lambda: serializer.save(obj, filename), repeat)
+        load_seconds = harness.time_best(lambda: serializer.load(filename), repeat)
+        file_bytes = os.path.getsize(filename)
+    return {
+        "save_seconds": save_seconds,
+        "load_seconds": load_seconds,
+        "save_mb_per_second": payload_bytes / save_seconds / 1e6,
+        "load_mb_per_second": payload_bytes / load_seconds / 1e6,
+        "payload_bytes": payload_bytes,
+        "file_bytes": file_bytes,
+    }
+
+
+def case_array(n_bytes: int, repeat: int) -> dict:
+    from benchmarks.workloads import build_array
+    array = build_array(n_bytes)
+    return _save_load(array, array.nbytes, repeat)
+
+
+def case_deep(n_nodes: int, depth: int, repeat: int) -> dict:
+    import dill
+    from benchmarks.workloads import build_deep
+    graph = build_deep(n_nodes, depth)
+    return _save_load(graph, len(dill.dumps(graph)), repeat)
+
+
+def case_leaves(n_fields: int, repeat: int) -> dict:
+    import dill
+    from benchmarks.workloads import Record
+    obj = Record(n_fields)
+    return _save_load(obj, len(dill.dumps(obj)), repeat)
+
+
+def run(args) -> list:
+    harness.quiet_package_logger()
+    n_bytes = int(args.array_mb * 1e6)
+    return [
+        harness.record("serializer", "array", {"bytes": n_bytes},
+                       harness.run_isolated(case_array, n_bytes, args.repeat)),
+        harness.record("serializer", "deep", {"nodes": args.nodes, "depth": args.depth},
+                       harness.run_isolated(case_deep, args.nodes, args.depth, args.repeat)),
+        harness.record("serializer", "leaves", {"fields": args.fields},
+                       harness.run_isolated(case_leaves, args.fields, args.repeat)),
+    ]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--array-mb", type=float, default=64, help="Size of the array case in MB.")
+    parser.add_argument("--nodes", type=int, default=5000, help="Objects in the deep graph case.")
+    parser.add_argument("--depth", type=int, default=16, help="Chain length in the deep graph case.")
+    parser.add_argument("--fields", type=int, default=5000, help="Attributes in the many-leaves case.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/serializer-<timestamp>.json).")
+    args = parser.parse_args()
+    results = run(args)
+    harness.print_results(results)
+    print(f"Results written to {harness.write_results(results, args.output, name='serializer')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark for ObjectSerializer.load on deep and wide object graphs.
+
+Compares the indexed loader against the previous implementation, which resolved the
+class and probed each chunk name with separate HDF5 lookups for every node.
+
+Usage:
+    python -m benchmarks.bench_serializer_load --nodes 50000 --depth 8
+"""
+import argparse
+import importlib
+import os
+import tempfile
+
+import dill
+import h5py
+
+from slurmflow.serializer import ObjectSerializer
+from benchmarks.harness import time_best
+from benchmarks.workloads import build_wide, build_deep
+
+
+def legacy_load(serializer, hdf_file, current_path):
+    """The pre-index loader, kept here as the baseline for comparison."""
+    if current_path not in hdf_file:
+        raise ValueError(f"Path {current_path} does not exist in the HDF5 file.")
+    if isinstance(hdf_file[current_path], h5py.Group) and 'type' in hdf_file[current_path].attrs:
+        module_name, class_name = hdf_file[current_path].attrs['type'].rsplit('.', 1)
+        obj_type = getattr(importlib.import_module(module_name), class_name)
+        obj = obj_type.__new__(obj_type)
+        for attr_name in hdf_file[current_path].keys():
+            if not attr_name.startswith('__'):
+                attr_path = f'{current_path}/{attr_name}'.lstrip('/')
+                setattr(obj, attr_name, legacy_load(serializer, hdf_file, attr_path))
+        return obj
+    serialized_data = []
+    i = 0
+    while f'{current_path}/chunk_{i}' in hdf_file:
+        serialized_data.append(hdf_file[f'{current_path}/chunk_{i}'][()].tobytes())
+        i += 1
+    concatenated_data = b''.join(serialized_data)
+    try:
+        decompressed_data = serializer.decompress_data(concatenated_data)
+    except TypeError:
+        decompressed_data = concatenated_data
+    return dill.loads(decompressed_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, default=5000, help='Approximate number of objects in each graph.')
+    parser.add_argument('--depth', type=int, default=8, help='Chain length of the deep graph.')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best is reported).')
+    args = parser.parse_args()
+
+    serializer = ObjectSerializer()
+    graphs = {
+        'wide': build_wide(args.nodes),
+        'deep': build_deep(args.nodes, args.depth),
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, graph in graphs.items():
+            filename = os.path.join(tmpdir, f'{name}.h5')
+            serializer.save(graph, filename)
+
+            def run_legacy():
+                with h5py.File(filename, 'r') as hdf_file:
+                    legacy_load(serializer, hdf_file, '/')
+
+            legacy = time_best(run_legacy, args.repeat)
+            indexed = time_best(lambda: serializer.load(filename), args.repeat)
+            print(f"{name:>5}: legacy {legacy:8.3f}s  indexed {indexed:8.3f}s  speedup {legacy / indexed:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
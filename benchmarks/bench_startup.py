@@ -0,0 +1,97 @@
+"""
+Startup benchmarks: module import time and SlurmDriver construction cost.
+
+Every measurement runs in a fresh interpreter so that nothing is already imported or cached.
+
+Cases:
+    import:      time to import each slurmflow module, and whether the heavy
+                 dependencies (h5py, blosc2, dill, numpy, yaml) were loaded by it.
+                 The measurement itself lives in slurmflow.startup, so installed
+                 copies can run it too (python -m slurmflow.startup).
+    driver_init: time of the first and of subsequent SlurmDriver() constructions
+                 against the fake Slurm binaries, with a cold and a warm on-disk
+                 capability cache.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5 --latency 0.05
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from slurmflow import startup
+from benchmarks import harness
+
+DRIVER_SCRIPT = """
+import time, json, logging
+from slurmflow.driver import SlurmDriver
+logging.getLogger("slurmflow").setLevel(logging.WARNING)
+start = time.perf_counter()
+SlurmDriver()
+first = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range({count}):
+    SlurmDriver()
+rest = (time.perf_counter() - start) / {count}
+print(json.dumps({{"first_seconds": first, "subsequent_seconds": rest}}))
+"""
+
+
+def _run_child(script: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(harness.BENCHMARK_DIR))
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_import(module: str, repeat: int) -> dict:
+    result = startup.time_import(module, repeat)
+    return {"seconds": result["seconds"], "heavy_modules_loaded": len(result["heavy_modules"])}
+
+
+def bench_driver_init(latency: float, count: int, repeat: int) -> dict:
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmpdir, harness.fake_slurm(tmpdir, latency=latency):
+        cache_file = os.path.join(tmpdir, "probe.json")
+        os.environ["SLURMFLOW_PROBE_CACHE"] = cache_file
+        for label in ("cold", "warm"):
+            runs = []
+            for _ in range(repeat):
+                if label == "cold" and os.path.exists(cache_file):
+                    os.remove(cache_file)
+                runs.append(_run_child(DRIVER_SCRIPT.format(count=count)))
+            metrics[f"{label}_first_seconds"] = min(run["first_seconds"] for run in runs)
+            metrics[f"{label}_subsequent_seconds"] = min(run["subsequent_seconds"] for run in runs)
+    return metrics
+
+
+def run(args) -> list:
+    results = []
+    for module in startup.MODULES:
+        results.append(harness.record("startup", "import", {"module": module}, bench_import(module, args.repeat)))
+    params = {"latency": args.latency, "constructions": args.constructions}
+    results.append(harness.record("startup", "driver_init", params,
+                                  bench_driver_init(args.latency, args.constructions, args.repeat)))
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency of each Slurm command (s).")
+    parser.add_argument("--constructions", type=int, default=100, help="SlurmDriver() calls after the first one.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement (best is reported).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/startup-<timestamp>.json).")
+    args = parser.parse_args()
+    results = run(args)
+    harness.print_results(results)
+    print(f"Results written to {harness.write_results(results, args.output, name='startup')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+Results are matched on (benchmark, case, params). Metrics ending in '_seconds' or
+'_bytes' are treated as lower-is-better, metrics ending in '_per_second' as
+higher-is-better; any other metric is shown but never flagged.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Exits with status 1 if any metric regressed by more than the threshold.
+"""
+import sys
+import json
+import argparse
+
+
+def _load(path: str) -> dict:
+    with open(path) as fh:
+        document = json.load(fh)
+    return {
+        (r["benchmark"], r["case"], json.dumps(r["params"], sort_keys=True)): r["metrics"]
+        for r in document["results"]
+    }
+
+
+def _direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if unknown."""
+    if metric.endswith("_per_second"):
+        return 1
+    if metric.endswith("_seconds") or metric.endswith("_bytes"):
+        return -1
+    return 0
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list:
+    """
+    Returns one row per metric present in both files:
+    (key, metric, baseline value, candidate value, relative change, regressed).
+    """
+    rows = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        for metric in sorted(baseline[key].keys() & candidate[key].keys()):
+            old, new = baseline[key][metric], candidate[key][metric]
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+                continue
+            change = (new - old) / abs(old)
+            direction = _direction(metric)
+            regressed = direction != 0 and -direction * change > threshold
+            rows.append((key, metric, old, new, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", help="Result file of the reference version.")
+    parser.add_argument("candidate", help="Result file of the version under test.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression.")
+    args = parser.parse_args()
+
+    rows = compare(_load(args.baseline), _load(args.candidate), args.threshold)
+    for (benchmark, case, params), metric, old, new, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{benchmark:>10} {case:<10} {params:<40} {metric:<28} {old:>12.4g} {new:>12.4g} {change:>+8.1%} {flag}")
+    sys.exit(1 if any(row[-1] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+A stand-in for the Slurm command line tools, used by the benchmarks.
+
+The sbatch, squeue, sacct, scancel and sinfo scripts in this directory dispatch here. Putting the
+directory first on PATH makes SlurmDriver talk to a simulated queue instead of a cluster.
+
+Queue state lives in the directory named by FAKE_SLURM_STATE (default: /tmp/fake_slurm) as
+an append-only, tab-separated job log plus a cancellation log. Each job is given its
+start time, end time and final state when it is submitted, so queries only compare
+timestamps against the current time.
+
+Environment variables:
+    FAKE_SLURM_STATE:        Directory holding the queue state.
+    FAKE_SLURM_LATENCY:      Seconds to sleep at the start of every command (default 0).
+    FAKE_SLURM_LATENCY_<CMD>: Per-command override, e.g. FAKE_SLURM_LATENCY_SBATCH.
+    FAKE_SLURM_PENDING:      Seconds a new job stays pending (default 0).
+    FAKE_SLURM_RUNTIME:      Seconds a job runs once started (default 1).
+    FAKE_SLURM_FAILURE_RATE: Fraction of jobs that end in a failure state (default 0).
+    FAKE_SLURM_PARTITIONS:   Partitions as 'name:cpus:memory_mb:features' separated by ';'.
+                             A '*' after the name marks the default partition.
+    FAKE_SLURM_JOB_MEM:      Memory (MB) each running job is taken to occupy (default 4000).
+"""
+import os
+import re
+import sys
+import time
+import zlib
+import fcntl
+import getpass
+
+VERSION = "slurm 23.02.0-fake"
+FAILURE_STATES = ["TIMEOUT", "PREEMPTED", "NODE_FAIL", "OUT_OF_MEMORY", "FAILED"]
+EXIT_CODES = {"COMPLETED": "0:0", "CANCELLED": "0:15", "TIMEOUT": "0:15", "PREEMPTED": "0:15",
+              "NODE_FAIL": "0:0", "OUT_OF_MEMORY": "0:125", "FAILED": "1:0"}
+SHORT_STATES = {"PENDING": "PD", "RUNNING": "R"}
+DEFAULT_PARTITIONS = "standard*:256:1024000:avx2;gpu:64:512000:a100"
+JOBS_LOG = "jobs.log"
+CANCELLED_LOG = "cancelled.log"
+COUNTER = "next_id"
+LOCK = "lock"
+
+
+def state_dir() -> str:
+    path = os.environ.get("FAKE_SLURM_STATE", "/tmp/fake_slurm")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def final_state_for(job_id: int, failure_rate: float) -> str:
+    """Deterministically picks the final state of a job from its ID."""
+    if failure_rate <= 0:
+        return "COMPLETED"
+    draw = zlib.crc32(str(job_id).encode()) / 0xFFFFFFFF
+    if draw >= failure_rate:
+        return "COMPLETED"
+    return FAILURE_STATES[job_id % len(FAILURE_STATES)]
+
+
+class _Locked:
+    """Exclusive lock on the state directory for the duration of a write."""
+
+    def __init__(self, path):
+        self.path = os.path.join(path, LOCK)
+
+    def __enter__(self):
+        self.fh = open(self.path, "a")
+        fcntl.flock(self.fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fh, fcntl.LOCK_UN)
+        self.fh.close()
+
+
+def _allocate_ids(path: str, count: int) -> int:
+    counter = os.path.join(path, COUNTER)
+    first = 1000
+    if os.path.exists(counter):
+        with open(counter) as fh:
+            first = int(fh.read().strip() or first)
+    with open(counter, "w") as fh:
+        fh.write(str(first + count))
+    return first
+
+
+def add_jobs(path: str, specs: list) -> list:
+    """
+    Appends jobs to the log and returns their IDs.
+
+    Args:
+        path (str): The state directory.
+        specs (list): One dict per job with optional keys 'partition', 'name', 'user',
+                      'pending' (seconds), 'runtime' (seconds) and 'final_state'.
+    """
+    now = time.time()
+    failure_rate = float(os.environ.get("FAKE_SLURM_FAILURE_RATE", 0))
+    default_pending = float(os.environ.get("FAKE_SLURM_PENDING", 0))
+    default_runtime = float(os.environ.get("FAKE_SLURM_RUNTIME", 1))
+    lines, ids = [], []
+    with _Locked(path):
+        first = _allocate_ids(path, len(specs))
+        for offset, spec in enumerate(specs):
+            job_id = first + offset
+            start = now + spec.get("pending", default_pending)
+            end = start + spec.get("runtime", default_runtime)
+            final = spec.get("final_state") or final_state_for(job_id, failure_rate)
+            lines.append("\t".join([
+                str(job_id), spec.get("partition") or "standard", spec.get("name") or "python_job",
+                spec.get("user") or getpass.getuser(), f"{now:.6f}", f"{start:.6f}", f"{end:.6f}", final,
+            ]))
+            ids.append(job_id)
+        with open(os.path.join(path, JOBS_LOG), "a") as fh:
+            fh.write("\n".join(lines) + "\n")
+    return ids
+
+
+def seed(path: str, count: int, **spec) -> list:
+    """Bulk-adds count identical jobs (see add_jobs for the spec keys)."""
+    return add_jobs(path, [spec] * count)
+
+
+def read_jobs(path: str) -> dict:
+    """Returns the job table keyed by job ID, with each job's state at the current time."""
+    jobs = {}
+    log = os.path.join(path, JOBS_LOG)
+    if os.path.exists(log):
+        with open(log) as fh:
+            for line in fh:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) != 8:
+                    continue
+                job_id, partition, name, user, submit, start, end, final = fields
+                jobs[job_id] = {"id": job_id, "partition": partition, "name": name, "user": user,
+                                "submit": float(submit), "start": float(start), "end": float(end),
+                                "final": final}
+    cancelled = os.path.join(path, CANCELLED_LOG)
+    if os.path.exists(cancelled):
+        with open(cancelled) as fh:
+            for line in fh:
+                job_id, _, when = line.strip().partition("\t")
+                if job_id in jobs and float(when) < jobs[job_id]["end"]:
+                    jobs[job_id]["end"] = float(when)
+                    jobs[job_id]["final"] = "CANCELLED"
+    now = time.time()
+    for job in jobs.values():
+        if now < job["start"] and job["final"] != "CANCELLED":
+            job["state"] = "PENDING"
+        elif now < job["end"]:
+            job["state"] = "RUNNING"
+        else:
+            job["state"] = job["final"]
+    return jobs
+
+
+def _elapsed(job: dict) -> str:
+    now = time.time()
+    seconds = max(0, int(min(now, job["end"]) - job["start"])) if now >= job["start"] else 0
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _parse_options(argv: list, flags: dict) -> tuple:
+    """
+    Minimal option parser. flags maps every accepted option spelling to
+    (canonical name, takes_value). Returns (options, positional arguments).
+    """
+    options, positional = {}, []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        key, eq, value = arg.partition("=")
+        if key in flags:
+            name, takes_value = flags[key]
+            if takes_value:
+                if not eq:
+                    i += 1
+                    value = argv[i]
+                options[name] = value
+            else:
+                options[name] = True
+        elif arg.startswith("-") and len(arg) > 2 and arg[:2] in flags and flags[arg[:2]][1]:
+            options[flags[arg[:2]][0]] = arg[2:]
+        else:
+            positional.append(arg)
+        i += 1
+    return options, positional
+
+
+def sbatch(argv: list) -> int:
+    options, positional = _parse_options(argv, {
+        "--version": ("version", False), "-V": ("version", False),
+        "--parsable": ("parsable", False),
+        "-p": ("partition", True), "--partition": ("partition", True),
+        "-J": ("job_name", True), "--job-name": ("job_name", True),
+    })
+    if options.get("version"):
+        print(VERSION)
+        return 0
+    if not positional:
+        print("sbatch: error: no batch script given", file=sys.stderr)
+        return 1
+    directives = {}
+    with open(positional[0]) as fh:
+        for line in fh:
+            match = re.match(r"#SBATCH\s+--([\w-]+)(?:=(.*))?", line)
+            if match:
+                directives[match.group(1)] = (match.group(2) or "").strip()
+    partitions = options.get("partition") or directives.get("partition") or "standard"
+    spec = {
+        # Like Slurm, a comma-separated list runs in whichever partition is listed first here
+        "partition": partitions.split(",")[0],
+        "name": options.get("job_name") or directives.get("job-name") or "python_job",
+    }
+    job_id = add_jobs(state_dir(), [spec])[0]
+    print(job_id if options.get("parsable") else f"Submitted batch job {job_id}")
+    return 0
+
+
+SQUEUE_FIELDS = {
+    "i": ("JOBID", lambda job: job["id"]),
+    "P": ("PARTITION", lambda job: job["partition"]),
+    "j": ("NAME", lambda job: job["name"]),
+    "u": ("USER", lambda job: job["user"]),
+    "t": ("ST", lambda job: SHORT_STATES.get(job["state"], job["state"])),
+    "T": ("STATE", lambda job: job["state"]),
+    "M": ("TIME", _elapsed),
+    "D": ("NODES", lambda job: "1"),
+    "R": ("NODELIST(REASON)", lambda job: "(Priority)" if job["state"] == "PENDING" else "node001"),
+}
+SQUEUE_DEFAULT_FORMAT = "%.18i %.9P %.8j %.8u %.2t %.10M %.6D %R"
+
+
+def _format_row(fmt: str, values: dict) -> str:
+    def field(match):
+        width, code = match.group(2), match.group(3)
+        value = values[code]
+        if width:
+            value = value[:int(width)]
+            value = value.rjust(int(width)) if match.group(1) else value.ljust(int(width))
+        return value
+    return re.sub(r"%(\.?)(\d*)([a-zA-Z])", field, fmt)
+
+
+def squeue(argv: list) -> int:
+    options, _ = _parse_options(argv, {
+        "-h": ("noheader", False), "--noheader": ("noheader", False),
+        "-o": ("format", True), "--format": ("format", True),
+        "-t": ("states", True), "--states": ("states", True),
+        "-j": ("jobs", True), "--jobs": ("jobs", True),
+        "-p": ("partition", True), "--partition": ("partition", True),
+        "-u": ("user", True), "--user": ("user", True),
+        "--me": ("me", False),
+    })
+    fmt = options.get("format", SQUEUE_DEFAULT_FORMAT)
+    jobs = read_jobs(state_dir())
+    selected = options["jobs"].split(",") if "jobs" in options else None
+    states = None
+    if "states" in options:
+        long_names = {v: k for k, v in SHORT_STATES.items()}
+        states = {long_names.get(s.upper(), s.upper()) for s in options["states"].split(",")}
+    partitions = set(options["partition"].split(",")) if "partition" in options else None
+    users = set(options["user"].split(",")) if "user" in options else None
+
+    rows = []
+    if not options.get("noheader"):
+        rows.append(_format_row(fmt, {code: title for code, (title, _) in SQUEUE_FIELDS.items()}))
+    for job_id in (selected if selected is not None else jobs):
+        job = jobs.get(job_id)
+        if job is None or job["state"] not in SHORT_STATES:
+            continue
+        if states and job["state"] not in states:
+            continue
+        if partitions and job["partition"] not in partitions:
+            continue
+        if users and job["user"] not in users:
+            continue
+        rows.append(_format_row(fmt, {code: get(job) for code, (_, get) in SQUEUE_FIELDS.items()}))
+    if rows:
+        print("\n".join(rows))
+    return 0
+
+
+SACCT_FIELDS = {
+    "jobid": lambda job: job["id"],
+    "jobname": lambda job: job["name"],
+    "partition": lambda job: job["partition"],
+    "user": lambda job: job["user"],
+    "state": lambda job: job["state"] if job["state"] != "CANCELLED" else f"CANCELLED by {os.getuid()}",
+    "exitcode": lambda job: EXIT_CODES.get(job["state"], "0:0"),
+    "elapsed": _elapsed,
+    "submit": lambda job: time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(job["submit"])),
+    "start": lambda job: time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(job["start"])),
+    "end": lambda job: time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(job["end"])),
+}
+
+
+def sacct(argv: list) -> int:
+    options, _ = _parse_options(argv, {
+        "-n": ("noheader", False), "--noheader": ("noheader", False),
+        "-P": ("parsable", False), "--parsable2": ("parsable", False),
+        "-X": ("allocations", False), "--allocations": ("allocations", False),
+        "-o": ("format", True), "--format": ("format", True),
+        "-j": ("jobs", True), "--jobs": ("jobs", True),
+        "-S": ("starttime", True), "--starttime": ("starttime", True),
+    })
+    fields = [f.strip() for f in options.get("format", "JobID,JobName,Partition,State,ExitCode").split(",")]
+    for field in fields:
+        if field.lower() not in SACCT_FIELDS:
+            print(f"sacct: error: Invalid field requested: \"{field}\"", file=sys.stderr)
+            return 1
+    jobs = read_jobs(state_dir())
+    selected = options["jobs"].split(",") if "jobs" in options else list(jobs)
+
+    rows = []
+    if not options.get("noheader"):
+        rows.append(fields)
+    for job_id in selected:
+        job = jobs.get(job_id)
+        if job is not None:
+            rows.append([SACCT_FIELDS[f.lower()](job) for f in fields])
+    if options.get("parsable"):
+        lines = ["|".join(row) for row in rows]
+    else:
+        lines = [" ".join(value[:20].rjust(20) for value in row) for row in rows]
+    if lines:
+        print("\n".join(lines))
+    return 0
+
+
+def scancel(argv: list) -> int:
+    _, job_ids = _parse_options(argv, {})
+    path = state_dir()
+    now = time.time()
+    with _Locked(path):
+        with open(os.path.join(path, CANCELLED_LOG), "a") as fh:
+            for job_id in job_ids:
+                if not job_id.startswith("-"):
+                    fh.write(f"{job_id}\t{now:.6f}\n")
+    return 0
+
+
+def partitions() -> list:
+    """Returns the configured partitions as dicts with 'name', 'default', 'cpus', 'memory' and 'features'."""
+    result = []
+    for entry in os.environ.get("FAKE_SLURM_PARTITIONS", DEFAULT_PARTITIONS).split(";"):
+        name, cpus, memory, features = (entry.split(":") + ["", "", ""])[:4]
+        result.append({"name": name.rstrip("*"), "default": name.endswith("*"),
+                       "cpus": int(cpus or 64), "memory": int(memory or 256000), "features": features or "(null)"})
+    return result
+
+
+def sinfo(argv: list) -> int:
+    options, _ = _parse_options(argv, {
+        "-h": ("noheader", False), "--noheader": ("noheader", False),
+        "-o": ("format", True), "--format": ("format", True),
+        "-p": ("partition", True), "--partition": ("partition", True),
+    })
+    fmt = options.get("format", "%9P %5a %6D %13C %8m %f")
+    selected = set(options["partition"].split(",")) if "partition" in options else None
+    job_mem = int(os.environ.get("FAKE_SLURM_JOB_MEM", 4000))
+    running = {}
+    for job in read_jobs(state_dir()).values():
+        if job["state"] == "RUNNING":
+            running[job["partition"]] = running.get(job["partition"], 0) + 1
+
+    rows = []
+    if not options.get("noheader"):
+        titles = {"P": "PARTITION", "a": "AVAIL", "D": "NODES", "C": "CPUS(A/I/O/T)", "c": "CPUS",
+                  "m": "MEMORY", "e": "FREE_MEM", "f": "AVAIL_FEATURES"}
+        rows.append(_format_row(fmt, titles))
+    for partition in partitions():
+        if selected and partition["name"] not in selected:
+            continue
+        allocated = min(partition["cpus"], running.get(partition["name"], 0))
+        values = {
+            "P": partition["name"] + ("*" if partition["default"] else ""),
+            "a": "up",
+            "D": "1",
+            "C": f"{allocated}/{partition['cpus'] - allocated}/0/{partition['cpus']}",
+            "c": str(partition["cpus"]),
+            "m": str(partition["memory"]),
+            "e": str(max(0, partition["memory"] - allocated * job_mem)),
+            "f": partition["features"],
+        }
+        rows.append(_format_row(fmt, values))
+    if rows:
+        print("\n".join(rows))
+    return 0
+
+
+COMMANDS = {"sbatch": sbatch, "squeue": squeue, "sacct": sacct, "scancel": scancel, "sinfo": sinfo}
+
+
+def main(command: str) -> None:
+    latency = os.environ.get(f"FAKE_SLURM_LATENCY_{command.upper()}", os.environ.get("FAKE_SLURM_LATENCY", 0))
+    if float(latency) > 0:
+        time.sleep(float(latency))
+    sys.exit(COMMANDS[command](sys.argv[1:]))
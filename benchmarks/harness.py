@@ -0,0 +1,153 @@
+"""
+Shared helpers for the benchmark scripts: timing, peak RSS measurement, the fake Slurm
+environment and the machine-readable result files.
+
+A result file is a JSON document of the form:
+
+    {
+        "metadata": {"version": ..., "commit": ..., "python": ..., "platform": ..., "timestamp": ...},
+        "results": [
+            {"benchmark": "driver", "case": "submit", "params": {...}, "metrics": {...}},
+            ...
+        ]
+    }
+
+Two such files can be compared with benchmarks/compare.py.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import resource
+import subprocess
+import contextlib
+import multiprocessing
+
+from typing import Callable, Dict, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_SLURM_DIR = os.path.join(BENCHMARK_DIR, "fake_slurm")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+
+def quiet_package_logger() -> None:
+    """The driver logs every submission at INFO level, which would dominate the timings."""
+    logging.getLogger("slurmflow").setLevel(logging.WARNING)
+
+
+def time_best(fn: Callable, repeat: int = 3) -> float:
+    """Returns the best wall-clock time of repeat calls to fn, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure_child(queue, fn, args):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        metrics = fn(*args)
+    except BaseException as e:
+        queue.put(e)
+        raise
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    metrics["baseline_rss_bytes"] = baseline * scale
+    metrics["peak_rss_bytes"] = peak * scale
+    queue.put(metrics)
+
+
+def run_isolated(fn: Callable, *args) -> Dict[str, float]:
+    """
+    Runs fn(*args) in a freshly spawned process and returns the dict of metrics it
+    produced, extended with the process's baseline and peak resident set size.
+
+    fn must be importable (defined at module level) and return a dict.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure_child, args=(queue, fn, args))
+    process.start()
+    metrics = queue.get()
+    process.join()
+    if isinstance(metrics, BaseException):
+        raise RuntimeError(f"Benchmark {fn.__name__} failed in the child process") from metrics
+    return metrics
+
+
+@contextlib.contextmanager
+def fake_slurm(state_dir: str, **env):
+    """
+    Puts the fake Slurm binaries first on PATH and points them at state_dir for the
+    duration of the block. Extra keyword arguments set FAKE_SLURM_<KEY> variables.
+    """
+    saved = dict(os.environ)
+    os.environ["PATH"] = FAKE_SLURM_DIR + os.pathsep + os.environ.get("PATH", "")
+    os.environ["FAKE_SLURM_STATE"] = state_dir
+    for key, value in env.items():
+        os.environ[f"FAKE_SLURM_{key.upper()}"] = str(value)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def fake_slurm_module():
+    """Imports the fake Slurm implementation, e.g. to seed a queue without forking sbatch."""
+    if FAKE_SLURM_DIR not in sys.path:
+        sys.path.insert(0, FAKE_SLURM_DIR)
+    import fake_slurm
+    return fake_slurm
+
+
+def record(benchmark: str, case: str, params: dict, metrics: dict) -> dict:
+    return {"benchmark": benchmark, "case": case, "params": params, "metrics": metrics}
+
+
+def metadata() -> dict:
+    try:
+        from importlib.metadata import version
+        package_version = version("slurm-workflow")
+    except Exception:
+        package_version = "unknown"
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCHMARK_DIR
+        ).stdout.strip() or "unknown"
+    except Exception:
+        commit = "unknown"
+    return {
+        "version": package_version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_results(results: List[dict], output: str = None, name: str = "results") -> str:
+    """
+    Writes results to output (default: benchmarks/results/<name>-<timestamp>.json)
+    and returns the path.
+    """
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as fh:
+        json.dump({"metadata": metadata(), "results": results}, fh, indent=2)
+    return output
+
+
+def print_results(results: List[dict]) -> None:
+    for result in results:
+        params = " ".join(f"{k}={v}" for k, v in result["params"].items())
+        metrics = " ".join(
+            f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in result["metrics"].items()
+        )
+        print(f"{result['benchmark']:>10} {result['case']:<14} {params:<32} {metrics}")
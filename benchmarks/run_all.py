@@ -0,0 +1,49 @@
+"""
+Runs every benchmark and writes the combined results to one file.
+
+Usage:
+    python -m benchmarks.run_all                # full sizes
+    python -m benchmarks.run_all --quick        # small sizes, for a smoke run
+"""
+import argparse
+
+from benchmarks import harness, bench_driver, bench_config, bench_serializer, bench_startup
+
+SUITES = {
+    "driver": bench_driver, "config": bench_config, "serializer": bench_serializer, "startup": bench_startup,
+}
+QUICK = {
+    "submit_jobs": [20], "queue_sizes": [1000, 10000], "follow_jobs": 50, "follow_log_kb": 64,
+    "leaves": [100, 1000], "depths": [1, 4],
+    "array_mb": 8, "nodes": 1000, "depth": 8, "fields": 1000,
+    "constructions": 10,
+    "repeat": 1,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Use small sizes.")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="Run only these suites.")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/all-<timestamp>.json).")
+    args = parser.parse_args()
+
+    results = []
+    for name, suite in SUITES.items():
+        if args.only and name not in args.only:
+            continue
+        suite_parser = argparse.ArgumentParser()
+        suite.add_arguments(suite_parser)
+        suite_args = suite_parser.parse_args([])
+        if args.quick:
+            for key, value in QUICK.items():
+                if hasattr(suite_args, key):
+                    setattr(suite_args, key, value)
+        results.extend(suite.run(suite_args))
+
+    harness.print_results(results)
+    print(f"Results written to {harness.write_results(results, args.output, name='all')}")
+
+
+if __name__ == "__main__":
+    main()
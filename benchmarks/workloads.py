@@ -0,0 +1,58 @@
+"""
+Synthetic workloads shared by the benchmarks. Everything here lives at module level so
+that ObjectSerializer can resolve the stored class names in a spawned process.
+"""
+import numpy as np
+
+
+class Node:
+    def __init__(self, value, children=()):
+        self.value = value
+        for i, child in enumerate(children):
+            setattr(self, f'child_{i}', child)
+
+
+class Record:
+    """An object with many small attributes, each stored as its own leaf."""
+
+    def __init__(self, n_fields):
+        for i in range(n_fields):
+            setattr(self, f'field_{i}', i)
+
+
+def build_wide(n_nodes):
+    """A root with n_nodes direct children, each holding a single small leaf."""
+    return Node(0, [Node(i) for i in range(n_nodes)])
+
+
+def build_deep(n_nodes, depth):
+    """n_nodes spread over chains of length depth hanging off a common root."""
+    chains = []
+    for c in range(max(1, n_nodes // depth)):
+        node = Node(c)
+        for d in range(depth - 1):
+            node = Node(d, [node])
+        chains.append(node)
+    return Node(-1, chains)
+
+
+def build_array(n_bytes, seed=0):
+    """A float64 array of roughly n_bytes, half smooth and half noise so it compresses partially."""
+    n = max(1, n_bytes // 8)
+    rng = np.random.default_rng(seed)
+    array = np.linspace(0.0, 1.0, n)
+    array[n // 2:] = rng.random(n - n // 2)
+    return array
+
+
+def build_config(n_leaves, depth):
+    """
+    A config with a chain of depth placeholders (each referring to the previous link)
+    and n_leaves leaves that refer to the end of the chain, so compiling every leaf
+    takes depth substitutions.
+    """
+    chain = {'k0': 'root'}
+    for i in range(1, depth + 1):
+        chain[f'k{i}'] = f'{{{{chain.k{i - 1}}}}}/l{i}'
+    leaves = {f'leaf{i}': f'{{{{chain.k{depth}}}}}/{i}' for i in range(n_leaves)}
+    return {'chain': chain, 'leaves': leaves}
@@ -1,17 +1,21 @@
 import re
-import yaml
 import logging
 import argparse
 import sys
 import os
 
 from . import logger
+from . import metrics
+from .lazy import LazyModule
+
+yaml = LazyModule('yaml')  # Imported on first load or save
 
 class ConfigParser:
 
     def __init__(self, config_source, parent_config_data=None):
         self.parent_config_data = parent_config_data
         self.config_data = None
+        self._flat_cache = None  # Flattened lookup table, only held for the duration of compile()
         if isinstance(config_source, str):
             self._load_config_from_file(config_source)
         elif isinstance(config_source, dict):
@@ -75,16 +79,28 @@ class ConfigParser:
         else:
             return data
 
-    def _substitute_variables(self, data):
+    def _flatten_config(self):
         flat_config_data = self._flatten_dict(self.config_data)
         if self.parent_config_data:
             flat_parent_config_data = self._flatten_dict(self.parent_config_data)
             flat_config_data = {**flat_parent_config_data, **flat_config_data}
+        return flat_config_data
+
+    def _substitute_variables(self, data):
+        flat_config_data = self._flat_cache
+        if flat_config_data is not None:
+            metrics.incr("config.flatten_cache_hits")
+        else:
+            metrics.incr("config.flatten_cache_misses")
+            flat_config_data = self._flatten_config()
 
         def replacer(match):
             key = match.group(1)
             if key not in flat_config_data:
+                metrics.incr("config.placeholders_missing")
                 logging.warning(f"Key for substitution not found in config data: {key}")
+            else:
+                metrics.incr("config.placeholders_resolved")
             substitution = str(flat_config_data.get(key, match.group(0)))
             return substitution
 
@@ -92,6 +108,7 @@ class ConfigParser:
 
         # Keep substituting until there are no more placeholders to substitute
         while True:
+            metrics.incr("config.substitution_passes")
             new_data = pattern.sub(replacer, data)
             if new_data == data:  # No more substitutions were made
                 break
@@ -170,7 +187,13 @@ class ConfigParser:
                 return d
             return argparse.Namespace(**{k: nested_dict_to_namespace(v) for k, v in d.items()}) 
 
-        compile_recursive(self.config_data) # accesses compiled_data
+        # The config cannot change while compiling, so flatten it once for all lookups
+        with metrics.timer("config.compile_seconds"):
+            self._flat_cache = self._flatten_config()
+            try:
+                compile_recursive(self.config_data) # accesses compiled_data
+            finally:
+                self._flat_cache = None
 
         if subsections:
             compiled_data = {k: v for k, v in compiled_data.items() if any(subsection in k for subsection in subsections)}
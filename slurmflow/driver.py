@@ -1,10 +1,265 @@
 import os
+import json
+import math
 import time
+import shlex
+import shutil
 import subprocess
 import tempfile
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from . import logger
+from . import metrics
+
+# The capability probe (sbatch --version, plus sinfo once partitions are asked for) is cached
+# per process and, if a cache file is configured, on disk. Entries older than the TTL (in
+# seconds) are re-probed.
+PROBE_CACHE_ENV = "SLURMFLOW_PROBE_CACHE"
+PROBE_TTL_ENV = "SLURMFLOW_PROBE_TTL"
+DEFAULT_PROBE_TTL = 3600.0
+
+# Probe results shared by every SlurmDriver in this process, keyed by the resolved sbatch path
+_capability_cache: Dict[str, dict] = {}
+
+# Slurm parameters used by generate_slurm_args when they are not given
+DEFAULT_SLURM_ARGS = {
+    "partition": "standard",
+    "mem": "8G",
+    "time": "1:00:00",
+    "job_name": "python_job",
+    "requeue": False,
+}
+
+
+def _parse_mem_mb(value) -> float:
+    """
+    Converts a Slurm memory specification (e.g. '8G', '500M', 4000) to megabytes.
+    Values that cannot be parsed (e.g. 'N/A') count as 0. Ranges ('1000-2000') use the upper bound.
+    """
+    value = str(value).strip().upper().rpartition("-")[2]
+    units = {"K": 1 / 1024, "M": 1, "G": 1024, "T": 1024 ** 2}
+    scale = units.get(value[-1:])
+    if scale is not None:
+        value = value[:-1]
+    try:
+        return float(value) * (scale or 1)
+    except ValueError:
+        return 0.0
+
+
+class PartitionPlacement:
+    """
+    A placement policy that chooses the partition for each submission from a list of candidates.
+
+    The choice is made from a snapshot of the candidate partitions (idle CPUs and free memory
+    from 'sinfo', pending depth from 'squeue'), which is refreshed at most once per TTL and
+    shared by every submission that uses this policy. Jobs placed since the last refresh are
+    added to the pending depth of their partition, so a burst of submissions is spread out
+    rather than all sent to whichever partition looked idlest at refresh time.
+
+    Strategies:
+        'least_loaded': submit to the candidate with the most idle CPUs left after its pending
+                        jobs, among those with enough free memory for the job.
+        'multi':        submit to all available candidates at once as a comma-separated partition
+                        list, ordered from least to most loaded, and let Slurm start the job
+                        wherever it can start first.
+
+    Attributes:
+        partitions (List[str]): The candidate partitions.
+        ttl (float): Maximum age of the snapshot in seconds.
+        strategy (str): 'least_loaded' or 'multi'.
+        snapshot (dict): The last snapshot, see SlurmDriver.partition_snapshot.
+        snapshot_time (float): When the snapshot was taken (time.time()), or None.
+    """
+
+    STRATEGIES = ("least_loaded", "multi")
+
+    def __init__(self, partitions: List[str], ttl: float = 60.0, strategy: str = "least_loaded") -> None:
+        if not partitions:
+            raise ValueError("At least one candidate partition is required.")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown placement strategy: {strategy}. Must be one of {self.STRATEGIES}.")
+        self.partitions = list(partitions)
+        self.ttl = ttl
+        self.strategy = strategy
+        self.snapshot: Dict[str, dict] = {}
+        self.snapshot_time: Optional[float] = None
+        self._placed: Dict[str, int] = {}
+
+    def refresh(self, driver: "SlurmDriver", force: bool = False) -> Dict[str, dict]:
+        """
+        Returns the partition snapshot, querying Slurm through driver if it is older than the TTL.
+        """
+        now = time.time()
+        if force or self.snapshot_time is None or now - self.snapshot_time >= self.ttl:
+            self.snapshot = driver.partition_snapshot(self.partitions)
+            self.snapshot_time = now
+            self._placed = {}
+            metrics.incr("driver.placement_snapshots")
+        return self.snapshot
+
+    def rank(self, driver: "SlurmDriver", mem: Optional[str] = None) -> List[str]:
+        """
+        Returns the available candidate partitions ordered from most to least attractive.
+
+        Partitions without enough free memory for mem are moved to the end. If the snapshot
+        has no usable information (e.g. sinfo failed), the candidate order is kept.
+        """
+        snapshot = self.refresh(driver)
+        needed_mb = _parse_mem_mb(mem) if mem is not None else 0.0
+
+        def score(indexed):
+            index, partition = indexed
+            info = snapshot.get(partition)
+            if info is None:
+                return (1, 0, 0, index)
+            pending = info["pending"] + self._placed.get(partition, 0)
+            fits = info["free_mem_mb"] >= needed_mb
+            return (0 if fits else 1, -(info["idle_cpus"] - pending), -info["free_mem_mb"], index)
+
+        candidates = [p for p in self.partitions if snapshot.get(p, {}).get("available", True)]
+        if not candidates:
+            candidates = list(self.partitions)
+        return [p for _, p in sorted(enumerate(candidates), key=score)]
+
+    def choose(self, driver: "SlurmDriver", slurm_args: Dict[str, str]) -> str:
+        """
+        Returns the value of the partition directive for a job with the given Slurm arguments.
+        """
+        # Without a mem argument, the job is submitted with the default, so rank for that
+        ranked = self.rank(driver, slurm_args.get("mem", DEFAULT_SLURM_ARGS["mem"]))
+        if self.strategy == "multi":
+            choice = ",".join(ranked)
+        else:
+            choice = ranked[0]
+            self._placed[choice] = self._placed.get(choice, 0) + 1
+        metrics.incr("driver.placement_choices", partition=choice)
+        return choice
+
+# Terminal statuses reported by check_job_status, derived from the Slurm job state in sacct
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "timeout", "preempted", "node_fail",
+                     "out_of_memory", "boot_fail", "deadline")
+_ACTIVE_STATES = {"PENDING": "pending", "REQUEUED": "pending", "REQUEUE_FED": "pending", "REQUEUE_HOLD": "pending",
+                  "SUSPENDED": "pending", "RUNNING": "running", "COMPLETING": "running", "CONFIGURING": "running",
+                  "RESIZING": "running", "SIGNALING": "running", "STAGE_OUT": "running", "STOPPED": "running"}
+_BATCH_SIZE = 1000  # Job IDs per squeue/sacct call, to stay well below command line limits
+
+
+_STATE_ALIASES = {"REVOKED": "cancelled", "SPECIAL_EXIT": "failed", "RESV_DEL_HOLD": "pending"}
+
+
+def _status_from_state(state: str) -> str:
+    """
+    Maps a Slurm job state as printed by sacct or 'squeue -o %T' (e.g. 'CANCELLED by 123')
+    to a registry status.
+    """
+    state = state.split()[0].rstrip("+") if state.strip() else ""
+    if state in _ACTIVE_STATES:
+        return _ACTIVE_STATES[state]
+    if state in _STATE_ALIASES:
+        return _STATE_ALIASES[state]
+    return state.lower() or "completed"
+
+
+def _parse_time_seconds(value) -> int:
+    """
+    Converts a Slurm time limit ('MM', 'MM:SS', 'HH:MM:SS', 'D-HH', 'D-HH:MM', 'D-HH:MM:SS') to seconds.
+    """
+    days, _, rest = str(value).strip().rpartition("-")
+    parts = [int(p) for p in rest.split(":")]
+    if days:
+        # With days, the fields are hours, minutes and seconds
+        parts += [0] * (3 - len(parts))
+        hours, minutes, seconds = parts
+    elif len(parts) == 3:
+        hours, minutes, seconds = parts
+    else:
+        # Without days, a single field is minutes and two fields are minutes and seconds
+        hours, minutes, seconds = 0, parts[0], parts[1] if len(parts) > 1 else 0
+    return ((int(days or 0) * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def _format_time(seconds: int) -> str:
+    """Formats seconds as a Slurm time limit ('H:MM:SS', or 'D-HH:MM:SS' from one day on)."""
+    days, seconds = divmod(int(seconds), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}-{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class RetryPolicy:
+    """
+    Decides which failed jobs are resubmitted and how their resources change.
+
+    When a job ends in one of the retry states and has been retried fewer than max_retries
+    times, it is resubmitted with the same command and arguments, except that:
+        - after OUT_OF_MEMORY, its memory request is multiplied by mem_factor (capped at max_mem);
+        - after TIMEOUT, its time limit is multiplied by time_factor (capped at max_time).
+
+    The resubmitted job's script exports SLURMFLOW_RETRY, SLURMFLOW_PREVIOUS_JOB_ID,
+    SLURMFLOW_PREVIOUS_STATE and, if a resume hint is available, SLURMFLOW_RESUME_FROM.
+    By default, the hint is the job's checkpoint path (see SlurmDriver.submit_job), if that
+    file exists. For example, it can be the file an ObjectSerializer last saved to.
+
+    Attributes:
+        max_retries (int): Maximum number of resubmissions per original job.
+        retry_states (Tuple[str]): The terminal statuses that are retried.
+        mem_factor (float): Memory multiplier applied after OUT_OF_MEMORY.
+        time_factor (float): Time limit multiplier applied after TIMEOUT.
+        max_mem (str): Upper bound for the memory request (e.g. '256G'), or None.
+        max_time (str): Upper bound for the time limit (e.g. '2-00:00:00'), or None.
+        resume_hint (Callable): Called as resume_hint(job_id, job) with the registry entry of
+                                the failed job. Returns the value of SLURMFLOW_RESUME_FROM, or None.
+    """
+
+    DEFAULT_RETRY_STATES = ("timeout", "preempted", "node_fail", "out_of_memory")
+
+    def __init__(self, max_retries: int = 3, retry_states=DEFAULT_RETRY_STATES, mem_factor: float = 2.0,
+                 time_factor: float = 2.0, max_mem: Optional[str] = None, max_time: Optional[str] = None,
+                 resume_hint: Optional[Callable[[str, dict], Optional[str]]] = None) -> None:
+        self.max_retries = max_retries
+        self.retry_states = tuple(retry_states)
+        self.mem_factor = mem_factor
+        self.time_factor = time_factor
+        self.max_mem = max_mem
+        self.max_time = max_time
+        self.resume_hint = resume_hint or self.checkpoint_hint
+
+    @staticmethod
+    def checkpoint_hint(job_id: str, job: dict) -> Optional[str]:
+        """The default resume hint: the job's checkpoint path, if the file exists."""
+        checkpoint = job.get("checkpoint")
+        if checkpoint and os.path.exists(checkpoint):
+            return checkpoint
+        return None
+
+    def should_retry(self, status: str, job: dict) -> bool:
+        return status in self.retry_states and job.get("retries", 0) < self.max_retries
+
+    def adjust(self, status: str, slurm_args: Dict[str, str]) -> Dict[str, str]:
+        """
+        Returns the Slurm arguments for the resubmission of a job that ended with status.
+        """
+        slurm_args = dict(slurm_args)
+        if status == "out_of_memory":
+            mem_mb = _parse_mem_mb(slurm_args.get("mem", DEFAULT_SLURM_ARGS["mem"])) * self.mem_factor
+            if self.max_mem is not None:
+                mem_mb = min(mem_mb, _parse_mem_mb(self.max_mem))
+            mem_mb = math.ceil(mem_mb)
+            slurm_args["mem"] = f"{mem_mb // 1024}G" if mem_mb % 1024 == 0 else f"{mem_mb}M"
+        elif status == "timeout":
+            try:
+                seconds = _parse_time_seconds(slurm_args.get("time", DEFAULT_SLURM_ARGS["time"])) * self.time_factor
+                if self.max_time is not None:
+                    seconds = min(seconds, _parse_time_seconds(self.max_time))
+            except ValueError:
+                # e.g. 'UNLIMITED', which cannot be extended
+                return slurm_args
+            slurm_args["time"] = _format_time(math.ceil(seconds))
+        return slurm_args
+
 
 class SlurmDriver:
     """
@@ -16,31 +271,186 @@ class SlurmDriver:
     Attributes:
         slurm_available (bool): Indicates if Slurm is available on the system.
         jobs_registry (dict): A dictionary to keep track of jobs.
+        probe_cache_file (str): Path of the on-disk capability cache, or None to cache in memory only.
+        probe_ttl (float): Age in seconds after which cached capabilities are re-probed.
+        placement (PartitionPlacement): Chooses the partition of jobs submitted without one, or None.
+        retry_policy (RetryPolicy): Resubmits jobs that fail in a retryable way, or None.
+        accounting_enabled (bool): False once sacct has reported that accounting is disabled (or is not
+                                   installed), after which finished jobs are reported as 'completed'.
     """
 
-    def __init__(self, verbose=False) -> None:
+    def __init__(self, verbose=False, probe_cache_file: Optional[str] = None, probe_ttl: Optional[float] = None,
+                 placement: Optional[PartitionPlacement] = None, retry_policy: Optional[RetryPolicy] = None) -> None:
         """
         Initializes the SlurmDriver with the availability of Slurm and an empty jobs registry.
+
+        Args:
+            verbose (bool): If True, logs the generated job scripts.
+            probe_cache_file (str, optional): On-disk capability cache. Defaults to $SLURMFLOW_PROBE_CACHE.
+            probe_ttl (float, optional): Capability cache TTL in seconds. Defaults to $SLURMFLOW_PROBE_TTL or 3600.
+            placement (PartitionPlacement, optional): Partition placement policy. Defaults to None,
+                which keeps the 'standard' partition default of generate_slurm_args.
+            retry_policy (RetryPolicy, optional): Resubmission policy for failed jobs. Defaults to None,
+                which leaves failed jobs as they are.
         """
-        self.slurm_available: bool = self._is_slurm_available()
-        self.jobs_registry: dict = {}
         self.verbose = verbose
+        self.placement = placement
+        self.retry_policy = retry_policy
+        self.accounting_enabled = True
+        self.probe_cache_file = probe_cache_file or os.environ.get(PROBE_CACHE_ENV)
+        if probe_ttl is None:
+            probe_ttl = os.environ.get(PROBE_TTL_ENV, DEFAULT_PROBE_TTL)
+        self.probe_ttl = float(probe_ttl)
+        self.jobs_registry: dict = {}
+        self.slurm_available: bool = self._is_slurm_available()
 
     def _is_slurm_available(self) -> bool:
         """
-        Checks if Slurm is available on the system by running 'sbatch --version' 
-        and checking if 'slurm' is in the output.
+        Checks if Slurm is available on the system, using the cached capability probe.
+        Only 'sbatch --version' is needed for this, so no request reaches slurmctld.
 
         Returns:
             bool: True if Slurm is available, False otherwise.
         """
+        return self.probe_capabilities(include_partitions=False)["available"]
+
+    def probe_capabilities(self, refresh: bool = False, include_partitions: bool = True) -> dict:
+        """
+        Returns the capabilities of the Slurm installation on this host.
+
+        The probe runs 'sbatch --version' at most once per TTL. Partitions and node features
+        come from 'sinfo', which queries slurmctld, so it only runs the first time they are
+        asked for within the TTL. Results are shared by all drivers in the process and, if
+        probe_cache_file is set, by all processes using that file.
+
+        Args:
+            refresh (bool): If True, ignores the caches and probes again.
+            include_partitions (bool): If True, also returns the partitions and features.
+
+        Returns:
+            dict: With keys 'available' (bool), 'version' (str or None) and 'probed_at' (float),
+                  and with include_partitions also 'partitions' (list), 'default_partition'
+                  (str or None) and 'features' (list).
+        """
+        key = shutil.which("sbatch") or ""
+        now = time.time()
+        capabilities = None
+        if not refresh:
+            cached = _capability_cache.get(key)
+            if cached is not None and now - cached["probed_at"] < self.probe_ttl:
+                metrics.incr("driver.probe_cache_hits", source="memory")
+                capabilities = cached
+            else:
+                cached = self._read_probe_cache(key)
+                if cached is not None and now - cached["probed_at"] < self.probe_ttl:
+                    metrics.incr("driver.probe_cache_hits", source="disk")
+                    capabilities = _capability_cache[key] = cached
+
+        if capabilities is None:
+            metrics.incr("driver.probe_cache_misses")
+            capabilities = self._probe_slurm()
+            capabilities["probed_at"] = now
+            _capability_cache[key] = capabilities
+            self._write_probe_cache(key, capabilities)
+
+        if include_partitions and "partitions" not in capabilities:
+            capabilities.update(self._probe_partitions())
+            self._write_probe_cache(key, capabilities)
+        return dict(capabilities)
+
+    def _probe_slurm(self) -> dict:
+        """
+        Runs 'sbatch --version', which does not contact slurmctld. If Slurm is not available,
+        the partition fields are filled in as empty, since there is nothing to query.
+        """
+        capabilities = {"available": False, "version": None}
         try:
-            result = subprocess.run(
-                ["sbatch", "--version"], capture_output=True, text=True
-            )
-            return "slurm" in result.stdout
+            result = self._run(["sbatch", "--version"], capture_output=True, text=True)
         except Exception:
-            return False
+            result = None
+        if result is None or "slurm" not in result.stdout:
+            capabilities.update({"partitions": [], "default_partition": None, "features": []})
+            return capabilities
+        capabilities["available"] = True
+        capabilities["version"] = result.stdout.strip().split()[-1]
+        return capabilities
+
+    def _probe_partitions(self) -> dict:
+        """
+        Runs 'sinfo' to list the partitions, the default partition and the node features.
+        """
+        capabilities = {"partitions": [], "default_partition": None, "features": []}
+        try:
+            result = self._run(["sinfo", "-h", "-o", "%P|%f"], capture_output=True, text=True)
+        except Exception:
+            return capabilities
+        features = set()
+        for line in result.stdout.splitlines():
+            partition, _, partition_features = line.strip().partition("|")
+            if partition.endswith("*"):
+                partition = partition[:-1]
+                capabilities["default_partition"] = partition
+            if partition and partition not in capabilities["partitions"]:
+                capabilities["partitions"].append(partition)
+            features.update(f for f in partition_features.split(",") if f and f != "(null)")
+        capabilities["features"] = sorted(features)
+        return capabilities
+
+    def _read_probe_cache(self, key: str) -> Optional[dict]:
+        if not self.probe_cache_file:
+            return None
+        try:
+            with open(self.probe_cache_file, "r") as file:
+                return json.load(file).get(key)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _write_probe_cache(self, key: str, capabilities: dict) -> None:
+        if not self.probe_cache_file:
+            return
+        try:
+            with open(self.probe_cache_file, "r") as file:
+                entries = json.load(file)
+            if not isinstance(entries, dict):
+                entries = {}
+        except (OSError, ValueError):
+            entries = {}
+        entries[key] = capabilities
+        try:
+            cache_dir = os.path.dirname(os.path.abspath(self.probe_cache_file))
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file and rename it so concurrent readers never see a partial file
+            with tempfile.NamedTemporaryFile("w", dir=cache_dir, suffix=".tmp", delete=False) as file:
+                json.dump(entries, file)
+            os.replace(file.name, self.probe_cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to write Slurm capability cache {self.probe_cache_file}: {e}")
+
+    def _run(self, cmd, **kwargs) -> subprocess.CompletedProcess:
+        """
+        Runs a Slurm command through subprocess.run, recording its call count,
+        failures and latency when metrics are enabled.
+
+        Args:
+            cmd (list or str): The command to run, as passed to subprocess.run.
+            **kwargs: Keyword arguments forwarded to subprocess.run.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        if not metrics.is_enabled():
+            return subprocess.run(cmd, **kwargs)
+        command = os.path.basename(cmd.split()[0] if isinstance(cmd, str) else cmd[0])
+        metrics.incr("driver.subprocess_calls", command=command)
+        try:
+            with metrics.timer("driver.subprocess_seconds", command=command):
+                result = subprocess.run(cmd, **kwargs)
+        except Exception:
+            metrics.incr("driver.subprocess_errors", command=command)
+            raise
+        if result.returncode != 0:
+            metrics.incr("driver.subprocess_errors", command=command)
+        return result
 
     def generate_slurm_args(self, **kwargs) -> str:
         """
@@ -56,6 +466,8 @@ class SlurmDriver:
                       - time (str): Time limit (e.g., "1:00:00").
                       - job_name (str): Name of the job.
                       - output_dir (str): Directory for output and error files.
+                      - log_suffix (str): Appended to the job name in the output and error file names
+                        (e.g. '.retry1').
                       - gres (str): Generic resources required.
                       - requeue (bool): Whether to include the --requeue directive.
                       - ... (other Slurm parameters)
@@ -65,23 +477,20 @@ class SlurmDriver:
                 - A string with Slurm job submission arguments.
                 - The path to the output file.
                 - The path to the error file.
+            Both paths contain '%j', which Slurm replaces with the job ID, so jobs with the
+            same job_name keep separate logs.
         """
         # Default Slurm parameters
-        args = {
-            "partition": "standard",
-            "mem": "8G",
-            "time": "1:00:00",
-            "job_name": "python_job",
-            "requeue": False,  # Default value for requeue
-        }
+        args = dict(DEFAULT_SLURM_ARGS)
         
         # Update defaults with any provided keyword arguments
         args.update(kwargs)
     
         # Construct output and error file paths
         output_dir = args.get("output_dir", "")
-        output_path = os.path.join(output_dir, f'slurm_{args["job_name"]}.out')
-        error_path = os.path.join(output_dir, f'slurm_{args["job_name"]}.err')
+        log_suffix = args.pop("log_suffix", "")
+        output_path = os.path.join(output_dir, f'slurm_{args["job_name"]}{log_suffix}_%j.out')
+        error_path = os.path.join(output_dir, f'slurm_{args["job_name"]}{log_suffix}_%j.err')
     
         slurm_args = []
         
@@ -144,10 +553,10 @@ class SlurmDriver:
         Returns:
             str: The output of the 'scancel' command.
         """
-        result = subprocess.run(["scancel", job_id], capture_output=True, text=True)
+        result = self._run(["scancel", job_id], capture_output=True, text=True)
         return result.stdout
 
-    def list_jobs(self, state: Optional[str] = None) -> List[str]:
+    def list_jobs(self, state: Optional[str] = None, job_ids: Optional[List[str]] = None) -> List[str]:
         """
         Lists the Slurm jobs with the given state.
 
@@ -156,17 +565,80 @@ class SlurmDriver:
 
         Args:
             state (str, optional): The state of the Slurm jobs to be listed. Defaults to None.
+            job_ids (List[str], optional): Only lists these jobs, instead of every job in the queue.
 
         Returns:
             List[str]: The IDs of the Slurm jobs in the given state.
+
+        Raises:
+            subprocess.CalledProcessError: If job_ids is given and squeue fails, e.g. because slurmctld
+                                           did not respond, so that an empty list always means no jobs.
         """
         cmd = ["squeue", "-h", "-o", "%i"]
         if state:
             cmd.extend(["-t", state])
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.stdout.splitlines()
+        if job_ids is None:
+            result = self._run(cmd, capture_output=True, text=True)
+            return result.stdout.splitlines()
+        jobs = []
+        for i in range(0, len(job_ids), _BATCH_SIZE):
+            batch_cmd = cmd + ["-j", ",".join(job_ids[i:i + _BATCH_SIZE])]
+            result = self._run(batch_cmd, capture_output=True, text=True)
+            # squeue rejects IDs that have left its memory, which just means they are no longer queued
+            if result.returncode != 0 and "Invalid job id" not in result.stderr:
+                raise subprocess.CalledProcessError(result.returncode, batch_cmd, result.stdout, result.stderr)
+            jobs.extend(result.stdout.splitlines())
+        return jobs
+
+    def partition_snapshot(self, partitions: List[str]) -> Dict[str, dict]:
+        """
+        Queries the current load of the given partitions with one 'sinfo' and one 'squeue' call.
+
+        Args:
+            partitions (List[str]): The partitions to query.
 
-    def submit_job(self, cmd: str, slurm_args: Dict[str, str] = {}, env: Optional[str] = None, modules: List[str] = [],  track: bool = True, venv='mamba') -> str:
+        Returns:
+            Dict[str, dict]: For each partition that sinfo reported, a dict with 'available' (bool),
+                             'idle_cpus', 'total_cpus', 'free_mem_mb' (the most free memory on any one node)
+                             and 'pending' (number of pending jobs).
+        """
+        snapshot = {}
+        partition_list = ",".join(partitions)
+        try:
+            result = self._run(["sinfo", "-h", "-p", partition_list, "-o", "%P|%a|%C|%e"], capture_output=True, text=True)
+        except Exception as e:
+            logger.warning(f"Failed to query partitions with sinfo: {e}")
+            return snapshot
+        for line in result.stdout.splitlines():
+            fields = line.strip().split("|")
+            if len(fields) != 4:
+                continue
+            name, avail, cpus, free_mem = fields
+            name = name.rstrip("*")
+            # sinfo prints one line per group of similar nodes, so partitions can span several lines
+            info = snapshot.setdefault(name, {"available": False, "idle_cpus": 0, "total_cpus": 0, "free_mem_mb": 0.0, "pending": 0})
+            cpu_counts = cpus.split("/")
+            if len(cpu_counts) == 4:
+                info["idle_cpus"] += int(cpu_counts[1])
+                info["total_cpus"] += int(cpu_counts[3])
+            # %e is the free memory of a single node, and --mem is a per-node request, so keep the largest
+            info["free_mem_mb"] = max(info["free_mem_mb"], _parse_mem_mb(free_mem))
+            info["available"] = info["available"] or avail == "up"
+
+        try:
+            result = self._run(["squeue", "-h", "-t", "PD", "-p", partition_list, "-o", "%P"], capture_output=True, text=True)
+        except Exception as e:
+            logger.warning(f"Failed to query pending jobs with squeue: {e}")
+            return snapshot
+        for line in result.stdout.splitlines():
+            # Jobs submitted to several partitions are listed with all of them
+            for name in line.strip().split(","):
+                if name in snapshot:
+                    snapshot[name]["pending"] += 1
+        return snapshot
+
+    def submit_job(self, cmd: str, slurm_args: Dict[str, str] = {}, env: Optional[str] = None, modules: List[str] = [],  track: bool = True, venv='mamba',
+                   checkpoint: Optional[str] = None, exports: Optional[Dict[str, str]] = None) -> str:
         """
         Submits a Slurm job with the given parameters.
 
@@ -177,23 +649,33 @@ class SlurmDriver:
             container_path (str): The path to the container for the job.
             conda_env (str, optional): The conda environment to use. Defaults to None.
             modules (List[str], optional): The modules to load. Defaults to [].
-            slurm_args (Dict[str, str], optional): The Slurm arguments. Defaults to {}.
+            slurm_args (Dict[str, str], optional): The Slurm arguments. Defaults to {}. If no partition
+                is given and the driver has a placement policy, the policy chooses it.
+            checkpoint (str, optional): Where the job saves its checkpoint. It is exported as
+                SLURMFLOW_CHECKPOINT and used as the resume hint if the job is resubmitted.
+            exports (Dict[str, str], optional): Environment variables exported in the script before cmd.
 
         Returns:
             str: The ID of the submitted job.
         """
+        requested_args = dict(slurm_args)
+        exports = dict(exports or {})
+        if checkpoint:
+            exports["SLURMFLOW_CHECKPOINT"] = checkpoint
+        if self.placement is not None and "partition" not in slurm_args:
+            slurm_args = {**slurm_args, "partition": self.placement.choose(self, slurm_args)}
         slurm_args, output_path, error_path = self.generate_slurm_args(**slurm_args)
         logger.info(slurm_args)
         self.create_output_directory(os.path.dirname(output_path))
         self.create_output_directory(os.path.dirname(error_path))
-        script_content = self._create_script(cmd, slurm_args, env, modules, venv)
+        script_content = self._create_script(cmd, slurm_args, env, modules, venv, exports)
         logger.info(f"Script content: {script_content}")
         with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.sh') as tmpfile:
             tmpfile.write(script_content)
             tmpfile_path = tmpfile.name
             logger.info(f"Script path: {tmpfile_path}")
 
-        result = subprocess.run(['sbatch', tmpfile_path], capture_output=True, text=True)
+        result = self._run(['sbatch', tmpfile_path], capture_output=True, text=True)
         try:
             job_id = result.stdout.strip().split()[-1]
             logger.info(f"Job ID: {job_id}")
@@ -202,34 +684,149 @@ class SlurmDriver:
             logger.error(f"STDOUT: {result.stdout}")
             logger.error(f"STDERR: {result.stderr}")
             return
+        metrics.incr("driver.jobs_submitted")
+        # Slurm names the log files after the job ID, so record the actual paths
+        output_path = output_path.replace("%j", job_id)
+        error_path = error_path.replace("%j", job_id)
         if track:
-            self.jobs_registry[job_id] = {'status': 'submitted', 'script': tmpfile_path}
+            self.jobs_registry[job_id] = {'status': 'submitted', 'script': tmpfile_path,
+                                          'output': output_path, 'error': error_path,
+                                          'cmd': cmd, 'slurm_args': requested_args, 'env': env,
+                                          'modules': list(modules), 'venv': venv, 'checkpoint': checkpoint,
+                                          'retries': 0}
         return job_id
 
+    def follow_logs(self, job_ids: Optional[List[str]] = None, streams=("out", "err"),
+                    error_patterns: Optional[List[str]] = None, cancel_on_error: bool = False,
+                    poll_interval: float = 1.0, status_interval: float = 30.0, until_done: bool = True,
+                    timeout: Optional[float] = None):
+        """
+        Follows the output and error files of the tracked jobs and yields their new lines.
+
+        Only newly appended bytes are read, and the files of all jobs are multiplexed into
+        one stream. See LogFollower for details.
+
+        Args:
+            job_ids (List[str], optional): The jobs to follow. Defaults to every job in the registry.
+            streams (Tuple[str]): 'out', 'err' or both.
+            error_patterns (List[str], optional): Regular expressions that mark a line as an error.
+            cancel_on_error (bool): If True, cancels jobs as soon as they log an error line.
+            poll_interval (float): Maximum time in seconds between polls.
+            status_interval (float): Time in seconds between queue checks.
+            until_done (bool): If True, stops once none of the followed jobs is still in the queue.
+            timeout (float, optional): Stops after this many seconds.
+
+        Yields:
+            Tuple[str, str, str]: The job ID, the stream ('out' or 'err') and the line.
+        """
+        from .follower import LogFollower
+        follower = LogFollower(self, job_ids=job_ids, streams=streams, error_patterns=error_patterns,
+                               cancel_on_error=cancel_on_error)
+        return follower.follow(poll_interval=poll_interval, status_interval=status_interval,
+                               until_done=until_done, timeout=timeout)
+
+    def poll_statuses(self, job_ids: List[str]) -> Dict[str, str]:
+        """
+        Queries the status of many Slurm jobs at once.
+
+        One 'squeue' call finds the jobs that are still pending or running. 'squeue -j' also
+        lists jobs that have ended recently, so only active states are taken from it. For all
+        other jobs, one 'sacct' call tells how they ended. If sacct has no record of a job
+        yet (accounting lags behind the queue), the state squeue reported for it is used,
+        and if there is none, the job is left out so that its previous status is kept and it
+        is polled again. The same applies if sacct fails. Only if accounting is disabled or
+        sacct is not installed are such jobs reported as 'completed'.
+
+        Args:
+            job_ids (List[str]): The IDs of the jobs to query.
+
+        Returns:
+            Dict[str, str]: The status of each job that could be classified: 'pending', 'running'
+                            or one of TERMINAL_STATUSES.
+        """
+        statuses = {}
+        ended = {}
+        wanted = set(job_ids)
+        for i in range(0, len(job_ids), _BATCH_SIZE):
+            batch = job_ids[i:i + _BATCH_SIZE]
+            try:
+                result = self._run(["squeue", "-h", "-j", ",".join(batch), "-o", "%i|%T"],
+                                   capture_output=True, text=True)
+            except Exception as e:
+                logger.debug(f"squeue unavailable, looking up jobs in sacct: {e}")
+                continue
+            for line in result.stdout.splitlines():
+                job_id, _, state = line.strip().partition("|")
+                if job_id not in wanted:
+                    continue
+                status = _status_from_state(state)
+                if status in ('pending', 'running'):
+                    statuses[job_id] = status
+                else:
+                    ended[job_id] = status
+
+        finished = [job_id for job_id in job_ids if job_id not in statuses]
+        for i in range(0, len(finished), _BATCH_SIZE):
+            batch = finished[i:i + _BATCH_SIZE]
+            result = self._query_sacct(batch) if self.accounting_enabled else None
+            if not self.accounting_enabled:
+                for job_id in batch:
+                    statuses[job_id] = ended.get(job_id, 'completed')
+                continue
+            if result is None:
+                # sacct failed for another reason (e.g. slurmdbd is briefly unreachable). Leave the
+                # jobs unclassified, unless squeue saw how they ended, so they are polled again.
+                statuses.update((job_id, ended[job_id]) for job_id in batch if job_id in ended)
+                continue
+            for line in result.stdout.splitlines():
+                job_id, _, state = line.strip().partition("|")
+                if job_id in wanted:
+                    statuses[job_id] = _status_from_state(state)
+            for job_id in batch:
+                if job_id not in statuses and job_id in ended:
+                    statuses[job_id] = ended[job_id]
+        return statuses
+
+    def _query_sacct(self, job_ids: List[str]) -> Optional[subprocess.CompletedProcess]:
+        """
+        Runs 'sacct' for the states of job_ids. Returns None if it failed. If the failure shows
+        that accounting is disabled or sacct is not installed, accounting_enabled is cleared.
+        """
+        try:
+            result = self._run(["sacct", "-X", "-n", "-P", "-j", ",".join(job_ids), "-o", "JobID,State"],
+                               capture_output=True, text=True)
+        except OSError as e:
+            logger.info(f"sacct is not available, reporting finished jobs as completed: {e}")
+            self.accounting_enabled = False
+            return None
+        if result.returncode == 0:
+            return result
+        if "accounting storage is disabled" in result.stderr:
+            logger.info("Slurm accounting is disabled, reporting finished jobs as completed.")
+            self.accounting_enabled = False
+        else:
+            logger.warning(f"sacct failed, polling the finished jobs again later: {result.stderr.strip()}")
+        return None
+
     def check_job_status(self, job_id: str) -> str:
         """
         Checks the status of a Slurm job with the given job ID.
 
-        This method runs the 'squeue' command with the provided job ID and 
-        updates the status of the job in the jobs registry. If the job ID is not 
+        This method queries 'squeue' and, once the job has left the queue, 'sacct' (see poll_statuses),
+        and updates the status of the job in the jobs registry. If the job ID is not 
         in the jobs registry, it returns 'unknown job id'.
 
         Args:
             job_id (str): The ID of the Slurm job to check.
 
         Returns:
-            str: The status of the job.
+            str: The status of the job: 'pending', 'running' or one of TERMINAL_STATUSES.
         """
         if job_id in self.jobs_registry:
-            command = f"squeue -j {job_id} | tail -n +2 | awk '{{print $5}}'"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if 'PD' in result.stdout:  # Pending
-                self.jobs_registry[job_id]['status'] = 'pending'
-            elif 'R' in result.stdout:  # Running
-                self.jobs_registry[job_id]['status'] = 'running'
-            else:
-                self.jobs_registry[job_id]['status'] = 'completed'
-            return self.jobs_registry[job_id]['status']
+            job = self.jobs_registry[job_id]
+            # A job without an accounting record yet keeps its status until the next check
+            job['status'] = self.poll_statuses([job_id]).get(job_id, job['status'])
+            return job['status']
         else:
             return 'unknown job id'
 
@@ -237,25 +834,79 @@ class SlurmDriver:
         """
         Checks the status of all Slurm jobs in the jobs registry and optionally removes completed or failed jobs.
 
-        This method iterates over all job IDs in the jobs registry and checks 
-        their status by calling the check_job_status method. If remove_completed_failed is True, 
-        it removes jobs with 'completed' or 'failed' status from the registry. It returns the updated 
-        jobs registry.
+        The statuses of all jobs still being tracked are queried in bulk with poll_statuses.
+        If the driver has a retry policy, jobs that failed in a retryable way are resubmitted
+        (see resubmit_job). If clear_completed is True, jobs that have finished are removed
+        from the registry, except those that were resubmitted.
 
         Args:
-            remove_completed_failed (bool): If True, removes jobs with 'completed' or 'failed' status from the registry.
+            clear_completed (bool): If True, removes jobs with a terminal status from the registry.
 
         Returns:
             Dict[str, Dict[str, str]]: The updated jobs registry with the status of all jobs.
         """
-        job_ids = list(self.jobs_registry.keys())  # Create a copy of keys to iterate over
-        for job_id in job_ids:
-            if int(job_id) > 0:
-                status = self.check_job_status(job_id)
-                if clear_completed and status in ['completed']:
+        job_ids = [job_id for job_id, job in self.jobs_registry.items()
+                   if int(job_id) > 0 and job['status'] not in TERMINAL_STATUSES]
+        statuses = self.poll_statuses(job_ids) if job_ids else {}
+        for job_id, status in statuses.items():
+            job = self.jobs_registry[job_id]
+            job['status'] = status
+            if status in TERMINAL_STATUSES:
+                metrics.incr("driver.terminal_states", status=status)
+                if self.retry_policy is not None and self.retry_policy.should_retry(status, job):
+                    self.resubmit_job(job_id)
+
+        if clear_completed:
+            for job_id in list(self.jobs_registry):
+                job = self.jobs_registry[job_id]
+                if job['status'] in TERMINAL_STATUSES and 'resubmitted_as' not in job:
                     del self.jobs_registry[job_id]
         return self.jobs_registry
 
+    def resubmit_job(self, job_id: str) -> Optional[str]:
+        """
+        Resubmits a finished job with the same command, adjusting its resources with the retry policy.
+
+        The new job is registered with its retry count and the ID of the job it replaces, and
+        the old job's registry entry records the new ID under 'resubmitted_as'. The new job
+        writes its logs to slurm_<job_name>.retry<N>_<job ID>.out/.err next to the original ones.
+
+        Args:
+            job_id (str): The ID of the job to resubmit.
+
+        Returns:
+            str: The ID of the new job, or None if the job is unknown or could not be resubmitted.
+        """
+        job = self.jobs_registry.get(job_id)
+        if job is None or 'cmd' not in job:
+            logger.error(f"Cannot resubmit job {job_id}: it was not submitted with tracking by this driver.")
+            return None
+        policy = self.retry_policy or RetryPolicy()
+        status = job['status']
+        retries = job.get('retries', 0) + 1
+        slurm_args = policy.adjust(status, job['slurm_args'])
+        # Mark the retry's log files, which are already separate from the parent's by job ID
+        slurm_args['log_suffix'] = f".retry{retries}"
+        exports = {
+            "SLURMFLOW_RETRY": str(retries),
+            "SLURMFLOW_PREVIOUS_JOB_ID": job_id,
+            "SLURMFLOW_PREVIOUS_STATE": status.upper(),
+        }
+        hint = policy.resume_hint(job_id, job)
+        if hint:
+            exports["SLURMFLOW_RESUME_FROM"] = hint
+
+        new_job_id = self.submit_job(job['cmd'], slurm_args=slurm_args, env=job['env'], modules=job['modules'],
+                                     venv=job['venv'], checkpoint=job['checkpoint'], exports=exports)
+        if new_job_id is None:
+            return None
+        logger.info(f"Job {job_id} ended with status {status}; resubmitted as job {new_job_id} (retry {retries}).")
+        metrics.incr("driver.jobs_resubmitted", status=status)
+        job['resubmitted_as'] = new_job_id
+        self.jobs_registry[new_job_id]['retries'] = retries
+        self.jobs_registry[new_job_id]['parent'] = job_id
+        return new_job_id
+
     def cancel_job(self, job_id: str) -> bool:
         """
         Cancels a Slurm job with the given job ID.
@@ -271,13 +922,14 @@ class SlurmDriver:
             bool: True if the job was successfully cancelled, False otherwise.
         """
         if job_id in self.jobs_registry:
-            subprocess.run(['scancel', job_id])
+            self._run(['scancel', job_id])
             self.jobs_registry[job_id]['status'] = 'cancelled'
             return True
         else:
             return False
 
-    def _create_script(self, cmd: str, slurm_args: List[str], env: str, modules: List[str], venv: str) -> str:
+    def _create_script(self, cmd: str, slurm_args: List[str], env: str, modules: List[str], venv: str,
+                       exports: Optional[Dict[str, str]] = None) -> str:
         """
         Creates a script for a Slurm job with the given parameters.
 
@@ -289,6 +941,7 @@ class SlurmDriver:
             conda_env (str, optional): The conda environment to use. Defaults to None.
             modules (List[str]): The modules to load.
             slurm_args (Dict[str, str]): The Slurm arguments.
+            exports (Dict[str, str], optional): Environment variables to export before the command.
 
         Returns:
             str: The script for the Slurm job.
@@ -310,6 +963,9 @@ class SlurmDriver:
         if modules:
             for module in modules:
                 script_lines.append(f"module load {module}")
+        if exports:
+            for key, value in exports.items():
+                script_lines.append(f"export {key}={shlex.quote(str(value))}")
         script_lines.append(f"{cmd}")
         if self.verbose:
             logger.info(script_lines)
@@ -317,30 +973,25 @@ class SlurmDriver:
     
     def wait(self, sleep_time: int = 120) -> None:
         """
-        Waits for all Slurm jobs in the jobs registry to complete.
+        Waits for all Slurm jobs in the jobs registry to finish.
 
-        This method iterates over all job IDs in the jobs registry and checks 
-        their status by calling the check_job_status method. It waits until all 
-        jobs have 'completed' status.
+        This method refreshes the registry every sleep_time seconds (see refresh_registry)
+        until every job has a terminal status. Jobs resubmitted by the retry policy are
+        waited for as well. Jobs that ended unsuccessfully without being resubmitted are
+        logged as warnings.
 
         Returns:
             None
         """
-        # Get a list of all job IDs in the jobs registry
-        job_ids = list(self.jobs_registry.keys())
-        logger.info(f"The stored job_ids are {job_ids}")
-        jobs_complete = [False for _ in job_ids]
-        # Start an infinite loop
-        jobs_remaining = True
-        while not all(jobs_complete):
-            # Iterate over each job ID after a sleep time
+        logger.info(f"The stored job_ids are {list(self.jobs_registry.keys())}")
+        while self.jobs_registry:
             time.sleep(sleep_time)
-            for i, job_id in enumerate(job_ids):
-                # Check the status of the current job
-                status = self.check_job_status(job_id) 
-                logger.info(f"The status of job {job_id} is {status}")
-
-                if status == 'completed':
-                    jobs_complete[i] = True
-                else:
-                    jobs_complete[i] = False
+            self.refresh_registry()
+            for job_id, job in self.jobs_registry.items():
+                logger.info(f"The status of job {job_id} is {job['status']}")
+            if all(job['status'] in TERMINAL_STATUSES for job in self.jobs_registry.values()):
+                break
+
+        for job_id, job in self.jobs_registry.items():
+            if job['status'] != 'completed' and 'resubmitted_as' not in job:
+                logger.warning(f"Job {job_id} ended with status {job['status']}.")
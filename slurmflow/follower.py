@@ -0,0 +1,247 @@
+import os
+import re
+import sys
+import time
+import select
+import subprocess
+import ctypes
+import ctypes.util
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from . import logger
+from . import metrics
+
+# Jobs in these states may still write to their logs. 'squeue -j' also lists jobs that have
+# already ended (until MinJobAge passes), so the queue check filters on state.
+ACTIVE_SQUEUE_STATES = "PENDING,RUNNING,SUSPENDED,COMPLETING,CONFIGURING,REQUEUED,RESIZING,SIGNALING,STAGE_OUT,STOPPED"
+
+
+class _Inotify:
+    """
+    Minimal ctypes wrapper around Linux inotify, used only to wake the follower up early
+    when a watched directory changes. Writes from other hosts on shared filesystems do
+    not raise inotify events, so the follower still polls on a timeout.
+    """
+
+    MASK = 0x00000002 | 0x00000008 | 0x00000080 | 0x00000100  # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched = set()
+
+    def watch(self, directory: str) -> None:
+        if directory in self.watched or not os.path.isdir(directory):
+            return
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK) >= 0:
+            self.watched.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        """Blocks until an event arrives or timeout expires. Returns True if there were events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _create_inotify() -> Optional[_Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify unavailable, falling back to polling: {e}")
+        return None
+
+
+class LogFollower:
+    """
+    Follows the output and error files of many Slurm jobs at once.
+
+    For every followed job and file, the follower remembers the byte offset it has read up to.
+    Each poll stats all files and reads only the bytes appended since the last poll, and
+    only from files that grew. Complete lines are returned tagged with the job ID and the
+    stream ('out' or 'err'). A partial last line is held back until its newline arrives.
+
+    Lines can be matched against error patterns. Jobs with a matching line are recorded
+    in `errors` and, if cancel_on_error is set, cancelled through the driver so they do
+    not use up the rest of their allocation.
+
+    Attributes:
+        driver (SlurmDriver): The driver whose jobs_registry lists the jobs and their log files.
+        job_ids (List[str]): The jobs to follow, or None to follow every job in the registry.
+        streams (Tuple[str]): Which files to follow: 'out', 'err' or both.
+        error_patterns (List[re.Pattern]): Patterns that mark a line as an error.
+        cancel_on_error (bool): If True, jobs with an error line are cancelled.
+        errors (Dict[str, List[str]]): The error lines seen so far, by job ID.
+    """
+
+    STREAM_KEYS = {"out": "output", "err": "error"}
+
+    def __init__(self, driver, job_ids: Optional[List[str]] = None, streams: Tuple[str, ...] = ("out", "err"),
+                 error_patterns: Optional[List[str]] = None, cancel_on_error: bool = False,
+                 use_inotify: bool = True) -> None:
+        for stream in streams:
+            if stream not in self.STREAM_KEYS:
+                raise ValueError(f"Unknown stream: {stream}. Must be 'out' or 'err'.")
+        self.driver = driver
+        self.job_ids = list(job_ids) if job_ids is not None else None
+        self.streams = tuple(streams)
+        self.error_patterns = [re.compile(p) for p in (error_patterns or [])]
+        self.cancel_on_error = cancel_on_error
+        self.errors: Dict[str, List[str]] = {}
+        # Keyed by (job ID, path), so that a path reused by a later job starts from the beginning
+        self._offsets: Dict[Tuple[str, str], int] = {}
+        self._inodes: Dict[Tuple[str, str], int] = {}
+        self._partial: Dict[Tuple[str, str], bytes] = {}
+        self._shared_warned = set()
+        self._inotify = _create_inotify() if use_inotify else None
+
+    def _files(self) -> List[Tuple[str, str, str]]:
+        """
+        Returns (job ID, stream, path) for every followed file.
+
+        A file that several followed jobs write to (e.g. jobs registered with the same
+        fixed log path) is skipped with a warning: its lines cannot be attributed to one
+        job, and an error line in it must not cancel the other jobs.
+        """
+        job_ids = self.job_ids if self.job_ids is not None else list(self.driver.jobs_registry)
+        files = []
+        owners: Dict[str, set] = {}
+        for job_id in job_ids:
+            job = self.driver.jobs_registry.get(job_id, {})
+            for stream in self.streams:
+                path = job.get(self.STREAM_KEYS[stream])
+                if path:
+                    files.append((job_id, stream, path))
+                    owners.setdefault(path, set()).add(job_id)
+        shared = {path for path, jobs in owners.items() if len(jobs) > 1}
+        for path in shared - self._shared_warned:
+            logger.warning(f"Not following {path}: it is the log file of jobs {', '.join(sorted(owners[path]))}.")
+            self._shared_warned.add(path)
+        return [file for file in files if file[2] not in shared]
+
+    def _read_new(self, key: Tuple[str, str]) -> bytes:
+        """Returns the bytes appended to the file of key (job ID, path) since the last call, or b''."""
+        path = key[1]
+        metrics.incr("follower.stat_calls")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return b""
+        offset = self._offsets.get(key, 0)
+        if self._inodes.get(key, stat.st_ino) != stat.st_ino or stat.st_size < offset:
+            # The file was replaced or truncated (e.g. the job was requeued), so start over
+            offset = 0
+            self._partial.pop(key, None)
+        self._inodes[key] = stat.st_ino
+        if stat.st_size == offset:
+            return b""
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read(stat.st_size - offset)
+        self._offsets[key] = offset + len(data)
+        metrics.incr("follower.bytes_read", len(data))
+        return data
+
+    def _check_errors(self, job_id: str, line: str) -> None:
+        if not any(pattern.search(line) for pattern in self.error_patterns):
+            return
+        first_error = job_id not in self.errors
+        self.errors.setdefault(job_id, []).append(line)
+        if first_error:
+            logger.warning(f"Job {job_id} logged an error: {line}")
+            if self.cancel_on_error:
+                logger.info(f"Cancelling job {job_id} after error in its log.")
+                self.driver.cancel_job(job_id)
+                metrics.incr("follower.jobs_cancelled")
+
+    def poll(self, final: bool = False) -> List[Tuple[str, str, str]]:
+        """
+        Reads everything appended to the followed files since the last poll.
+
+        Args:
+            final (bool): If True, also returns partial last lines (e.g. once the jobs have finished).
+
+        Returns:
+            List[Tuple[str, str, str]]: (job ID, stream, line) for each new line, without the newline.
+        """
+        lines = []
+        for job_id, stream, path in self._files():
+            if self._inotify is not None:
+                self._inotify.watch(os.path.dirname(os.path.abspath(path)))
+            key = (job_id, path)
+            new_data = self._read_new(key)  # Read first: it drops the partial line if the file was truncated
+            data = self._partial.pop(key, b"") + new_data
+            if not data:
+                continue
+            chunks = data.split(b"\n")
+            rest = chunks.pop()  # Bytes after the last newline, empty if data ends with one
+            if rest:
+                if final:
+                    chunks.append(rest)
+                else:
+                    self._partial[key] = rest
+            for chunk in chunks:
+                line = chunk.decode("utf-8", errors="replace")
+                if self.error_patterns:
+                    self._check_errors(job_id, line)
+                lines.append((job_id, stream, line))
+        return lines
+
+    def follow(self, poll_interval: float = 1.0, status_interval: float = 30.0, until_done: bool = True,
+               timeout: Optional[float] = None) -> Iterator[Tuple[str, str, str]]:
+        """
+        Yields (job ID, stream, line) for new log lines as they are written.
+
+        Args:
+            poll_interval (float): Maximum time in seconds between polls. With inotify, local writes wake the follower sooner.
+            status_interval (float): Time in seconds between queue checks (one squeue call for the followed jobs).
+            until_done (bool): If True, stops once none of the followed jobs is still in the queue.
+            timeout (float, optional): Stops after this many seconds.
+
+        Yields:
+            Tuple[str, str, str]: The job ID, the stream ('out' or 'err') and the line.
+        """
+        start = time.monotonic()
+        last_status = None
+        try:
+            while True:
+                yield from self.poll()
+                now = time.monotonic()
+                if timeout is not None and now - start >= timeout:
+                    return
+                if until_done and (last_status is None or now - last_status >= status_interval):
+                    last_status = now
+                    job_ids = self.job_ids if self.job_ids is not None else list(self.driver.jobs_registry)
+                    try:
+                        active = self.driver.list_jobs(state=ACTIVE_SQUEUE_STATES, job_ids=job_ids)
+                    except subprocess.CalledProcessError as e:
+                        # Without an answer from squeue, keep following and ask again next interval
+                        logger.warning(f"Could not check the queue: {e.stderr.strip() if e.stderr else e}")
+                        active = True
+                    if not active:
+                        yield from self.poll(final=True)
+                        return
+                if self._inotify is not None:
+                    self._inotify.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Releases the inotify watch, if any. Offsets are kept, so polling can continue afterwards."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,32 @@
+import importlib
+
+
+class LazyModule:
+    """
+    A stand-in for a module that is only imported on first attribute access.
+
+    Heavy dependencies (h5py, blosc2, dill, numpy, yaml) are bound to a LazyModule at
+    module level, so importing slurmflow stays cheap for processes that never use them.
+
+    Attributes:
+        name (str): The fully qualified name of the wrapped module.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._module = None
+
+    def load(self):
+        """
+        Imports the wrapped module if it has not been imported yet and returns it.
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self.name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self.name}' ({state})>"
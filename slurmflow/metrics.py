@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import threading
+import contextlib
+
+from typing import Dict, Optional
+
+# Metrics are collected only when enabled, either by setting SLURMFLOW_METRICS=1 in the
+# environment or by calling enable(). When disabled, every hook below returns immediately.
+ENV_VAR = "SLURMFLOW_METRICS"
+
+_enabled: bool = os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class MetricsRegistry:
+    """
+    A thread-safe store of counters and timers.
+
+    Counters accumulate a number (e.g. calls, bytes). Timers accumulate the count, total
+    and maximum of observed durations in seconds. Both are keyed by a dot-separated name
+    (e.g. 'driver.subprocess_seconds') and an optional set of string labels.
+
+    Attributes:
+        counters (dict): Maps (name, labels) to the accumulated value.
+        timers (dict): Maps (name, labels) to a dict with 'count', 'sum' and 'max'.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[tuple, float] = {}
+        self.timers: Dict[tuple, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> tuple:
+        return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+    def incr(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Adds value to the counter identified by name and labels.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """
+        Records a single duration (in seconds) for the timer identified by name and labels.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                timer = self.timers[key] = {"count": 0, "sum": 0.0, "max": 0.0}
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Context manager that observes the wall-clock duration of its body.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        """
+        Clears all recorded counters and timers.
+        """
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def snapshot(self) -> Dict[str, list]:
+        """
+        Returns a JSON-serializable copy of all recorded metrics.
+
+        Returns:
+            dict: {'counters': [...], 'timers': [...]}, where each entry holds the metric
+                  'name', its 'labels' and its recorded values.
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            timers = [
+                {"name": name, "labels": dict(labels), **values}
+                for (name, labels), values in sorted(self.timers.items())
+            ]
+        return {"counters": counters, "timers": timers}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        Exports all recorded metrics as a JSON string (see snapshot for the layout).
+        """
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "slurmflow") -> str:
+        """
+        Exports all recorded metrics in the Prometheus text exposition format.
+
+        Counters are exported as '<prefix>_<name>_total'. Timers are exported as summaries
+        with '_count' and '_sum' series, plus a '_max' gauge. Dots in names become underscores.
+
+        Args:
+            prefix (str): Prefix prepended to every metric name.
+
+        Returns:
+            str: The exposition text, terminated by a newline.
+        """
+        def fmt_labels(labels):
+            if not labels:
+                return ""
+            def escape(v):
+                return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+        def metric_name(name):
+            return f"{prefix}_{name}".replace(".", "_").replace("-", "_")
+
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            timers = sorted(self.timers.items())
+
+        declared = set()
+        for (name, labels), value in counters:
+            full_name = metric_name(name) + "_total"
+            if full_name not in declared:
+                lines.append(f"# TYPE {full_name} counter")
+                declared.add(full_name)
+            lines.append(f"{full_name}{fmt_labels(labels)} {value}")
+
+        # Each family's samples must form one group, so the _max gauges follow all summaries
+        for (name, labels), values in timers:
+            full_name = metric_name(name)
+            if full_name not in declared:
+                lines.append(f"# TYPE {full_name} summary")
+                declared.add(full_name)
+            lines.append(f"{full_name}_count{fmt_labels(labels)} {values['count']}")
+            lines.append(f"{full_name}_sum{fmt_labels(labels)} {values['sum']}")
+
+        for (name, labels), values in timers:
+            full_name = metric_name(name) + "_max"
+            if full_name not in declared:
+                lines.append(f"# TYPE {full_name} gauge")
+                declared.add(full_name)
+            lines.append(f"{full_name}{fmt_labels(labels)} {values['max']}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+registry = MetricsRegistry()
+
+
+def enable() -> None:
+    """Turns metric collection on for this process."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Turns metric collection off for this process. Recorded values are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Returns True if metric collection is on."""
+    return _enabled
+
+
+def incr(name: str, value: float = 1, **labels) -> None:
+    """Adds value to a counter in the package registry if collection is enabled."""
+    if _enabled:
+        registry.incr(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """Records a duration in the package registry if collection is enabled."""
+    if _enabled:
+        registry.observe(name, seconds, **labels)
+
+
+def timer(name: str, **labels):
+    """
+    Returns a context manager timing its body into the package registry,
+    or a shared no-op context manager if collection is disabled.
+    """
+    if _enabled:
+        return registry.timer(name, **labels)
+    return _NULL_TIMER
+
+
+def reset() -> None:
+    """Clears the package registry."""
+    registry.reset()
+
+
+def to_json(indent: Optional[int] = None) -> str:
+    """Exports the package registry as JSON."""
+    return registry.to_json(indent=indent)
+
+
+def to_prometheus(prefix: str = "slurmflow") -> str:
+    """Exports the package registry in the Prometheus text format."""
+    return registry.to_prometheus(prefix=prefix)
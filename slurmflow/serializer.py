@@ -1,16 +1,37 @@
-import h5py
-import blosc2
+from __future__ import annotations
+
 import os
-import dill
 import tempfile
 import subprocess
 from subprocess import CalledProcessError
-import numpy as np
 from typing import Any
 import importlib
 from . import logger
+from . import metrics
+from .lazy import LazyModule
+
+# Heavy dependencies are imported on first use
+h5py = LazyModule('h5py')
+blosc2 = LazyModule('blosc2')
+dill = LazyModule('dill')
+np = LazyModule('numpy')
+
+# Leaves whose stored chunks fit under this many bytes are read up front in a
+# single sweep ordered by file offset; larger leaves are read on demand.
+SMALL_LEAF_BYTES = 1 << 20
+# Upper bound on the bytes held by that sweep at once. Leaves beyond it are read on demand.
+PREFETCH_BYTES = 64 << 20
 
 
+def _resolve_class(type_name: str) -> type:
+    """
+    Resolves a fully qualified class name (as stored in a group's 'type' attribute)
+    to the class object.
+    """
+    module_name, class_name = type_name.rsplit('.', 1)
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
 
 class ObjectSerializer:
     def __init__(self, **kwargs):
@@ -57,21 +78,25 @@ class ObjectSerializer:
 
             
     def compress_data(self, data: Any, chunksize: int = 10_000_000) -> [bytes]:
-        serialized_data = dill.dumps(data)
-        schunk = blosc2.SChunk(chunksize=chunksize)
-        for i in range(len(serialized_data) // chunksize + 1):
-            schunk.append_data(serialized_data[i*chunksize:(i+1)*chunksize])
-        cframe = schunk.to_cframe()
+        # The pickle phase is recorded by the caller, so this inner dumps counts as compression
+        with metrics.timer("serializer.compress_seconds"):
+            serialized_data = dill.dumps(data)
+            schunk = blosc2.SChunk(chunksize=chunksize)
+            for i in range(len(serialized_data) // chunksize + 1):
+                schunk.append_data(serialized_data[i*chunksize:(i+1)*chunksize])
+            cframe = schunk.to_cframe()
+        metrics.incr("serializer.bytes_compressed", len(cframe))
 
         # Chunk the cframe for HDF5 storage
         cframe_chunks = [cframe[i:i + chunksize] for i in range(0, len(cframe), chunksize)]
         return cframe_chunks
 
     def decompress_data(self, concatenated_cframe: [bytes]) -> Any:
-        reconstructed_schunk = blosc2.schunk_from_cframe(concatenated_cframe)
-        decompressed_data = b''.join(reconstructed_schunk.decompress_chunk(i) 
-                                     for i in range(reconstructed_schunk.nchunks))
-        return dill.loads(decompressed_data)
+        with metrics.timer("serializer.decompress_seconds"):
+            reconstructed_schunk = blosc2.schunk_from_cframe(concatenated_cframe)
+            decompressed_data = b''.join(reconstructed_schunk.decompress_chunk(i) 
+                                         for i in range(reconstructed_schunk.nchunks))
+            return dill.loads(decompressed_data)
 
     def ensure_path_exists(self, hdf_file: h5py.File, path: str) -> None:
         """
@@ -107,7 +132,7 @@ class ObjectSerializer:
             os.remove(filename)
 
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with h5py.File(filename, 'a') as hdf_file:
+        with metrics.timer("serializer.save_seconds"), h5py.File(filename, 'a') as hdf_file:
             self.ensure_path_exists(hdf_file, internal_path)
             self._recursive_store(hdf_file, obj, internal_path)
 
@@ -142,15 +167,20 @@ class ObjectSerializer:
                 self._recursive_store(hdf_file, attr_value, attr_path)
         else:
             logger.debug(f"Object does not have a __dict__. Serializing and storing directly at path: {current_path}")
-            serialized_data = dill.dumps(obj)            
+            with metrics.timer("serializer.pickle_seconds"):
+                serialized_data = dill.dumps(obj)
+            metrics.incr("serializer.bytes_pickled", len(serialized_data))
             cframe_chunks = self.compress_data(serialized_data)
 
             if current_path in hdf_file and current_path != '/':
                 logger.debug(f"Deleting existing object at path: {current_path} to create a new dataset")
                 del hdf_file[current_path]
                 
-            for i, chunk in enumerate(cframe_chunks):
-                hdf_file.create_dataset(f"{current_path}/chunk_{i}", data=np.void(chunk))
+            with metrics.timer("serializer.write_seconds"):
+                for i, chunk in enumerate(cframe_chunks):
+                    hdf_file.create_dataset(f"{current_path}/chunk_{i}", data=np.void(chunk))
+            metrics.incr("serializer.bytes_written", sum(len(chunk) for chunk in cframe_chunks))
+            metrics.incr("serializer.leaves_written")
 
     def load(self, filename: str, internal_path: str = '/') -> Any:
         """
@@ -159,36 +189,123 @@ class ObjectSerializer:
         This method loads an object from the specified path, reconstructing
         it and its nested objects by deserializing and decompressing the stored data.
         """
-        with h5py.File(filename, 'r') as hdf_file:
+        with metrics.timer("serializer.load_seconds"), h5py.File(filename, 'r') as hdf_file:
             return self._recursive_load(hdf_file, internal_path)
     
     def _recursive_load(self, hdf_file: h5py.File, current_path: str) -> Any:
+        """
+        Reconstructs the object stored at current_path.
+
+        The subtree is indexed in a single visititems pass (group types, child names and
+        chunk dataset handles), small leaves are read in one offset-ordered sweep, and the
+        object graph is then rebuilt from the in-memory index without further path lookups.
+        """
         if current_path not in hdf_file:
             raise ValueError(f"Path {current_path} does not exist in the HDF5 file.")
 
-        # Check if the current path is a dataset or a group
-        if isinstance(hdf_file[current_path], h5py.Group) and 'type' in hdf_file[current_path].attrs:
+        root = hdf_file[current_path]
+        with metrics.timer("serializer.index_seconds"):
+            types, children, chunks = self._index_tree(root)
+        with metrics.timer("serializer.read_seconds"):
+            payloads = self._read_small_leaves(root, chunks)
+        metrics.incr("serializer.bytes_read", sum(len(chunk) for chunk in payloads.values()))
+        # Resolved classes are memoized for this load only, so reloaded modules are picked up by the next one
+        classes = {}
+        return self._reconstruct('', root, types, children, chunks, payloads, classes)
+
+    def _index_tree(self, root: h5py.Group) -> tuple:
+        """
+        Walks the subtree under root once and collects everything needed for reconstruction.
+
+        Returns:
+            A tuple (types, children, chunks), all keyed by the path relative to root ('' for root):
+                - types: the stored class name of each object group.
+                - children: the member names of each group, in HDF5 iteration order.
+                - chunks: a mapping from chunk index to (dataset name, file offset, stored size)
+                  for each leaf. Only names are kept, so no dataset handles stay open.
+        """
+        types, children, chunks = {}, {}, {}
+        if not isinstance(root, h5py.Group):
+            return types, children, chunks
+
+        root_type = root.attrs.get('type')
+        if root_type is not None:
+            types[''] = root_type
+
+        def visitor(name, node):
+            parent, _, child = name.rpartition('/')
+            children.setdefault(parent, []).append(child)
+            if isinstance(node, h5py.Dataset):
+                if child.startswith('chunk_') and child[6:].isdigit():
+                    chunks.setdefault(parent, {})[int(child[6:])] = (
+                        name, node.id.get_offset() or 0, node.id.get_storage_size())
+            else:
+                type_name = node.attrs.get('type')
+                if type_name is not None:
+                    types[name] = type_name
+
+        root.visititems(visitor)
+        return types, children, chunks
+
+    def _read_small_leaves(self, root: h5py.Group, chunks: dict) -> dict:
+        """
+        Reads every chunk belonging to a leaf whose total stored size is at most
+        SMALL_LEAF_BYTES, in order of file offset, until PREFETCH_BYTES have been read.
+
+        Returns:
+            dict: A mapping from (leaf path, chunk index) to the raw chunk bytes.
+        """
+        leaves = []
+        for path, leaf_chunks in chunks.items():
+            size = sum(size for _, _, size in leaf_chunks.values())
+            if size <= SMALL_LEAF_BYTES:
+                leaves.append((min(offset for _, offset, _ in leaf_chunks.values()), size, path))
+        leaves.sort(key=lambda leaf: leaf[0])
+
+        pending = []
+        total = 0
+        for _, size, path in leaves:
+            if total + size > PREFETCH_BYTES:
+                break
+            total += size
+            for i, (name, offset, _) in chunks[path].items():
+                pending.append((offset, path, i, name))
+        pending.sort(key=lambda item: item[0])
+        return {(path, i): root[name][()].tobytes() for _, path, i, name in pending}
+
+    def _reconstruct(self, path: str, root: h5py.Group, types: dict, children: dict, chunks: dict,
+                     payloads: dict, classes: dict) -> Any:
+        """
+        Rebuilds the object at path from the index produced by _index_tree.
+        Prefetched chunks are removed from payloads as they are used, so their bytes can be freed.
+        """
+        type_name = types.get(path)
+        if type_name is not None:
             # It's a group, so treat it as an object with __dict__
-            class_name = hdf_file[current_path].attrs['type']
-            module_name, class_name = class_name.rsplit('.', 1)
-            module = importlib.import_module(module_name)
-            obj_type = getattr(module, class_name)
+            obj_type = classes.get(type_name)
+            if obj_type is None:
+                obj_type = classes[type_name] = _resolve_class(type_name)
             obj = obj_type.__new__(obj_type)
 
-            for attr_name in hdf_file[current_path].keys():
+            for attr_name in children.get(path, ()):
                 # Exclude special attributes like '__dict__'
                 if not attr_name.startswith('__'):
-                    attr_path = f'{current_path}/{attr_name}'.lstrip('/')
-                    nested_obj = self._recursive_load(hdf_file, attr_path)
+                    attr_path = f'{path}/{attr_name}' if path else attr_name
+                    nested_obj = self._reconstruct(attr_path, root, types, children, chunks, payloads, classes)
                     setattr(obj, attr_name, nested_obj)
 
             return obj
         else:
-            # It's a dataset, so load and deserialize the data
+            # It's a leaf, so concatenate its chunks in order and deserialize the data
+            leaf_chunks = chunks.get(path, {})
             serialized_data = []
             i = 0
-            while f'{current_path}/chunk_{i}' in hdf_file:
-                chunk = hdf_file[f'{current_path}/chunk_{i}'][()].tobytes()
+            while i in leaf_chunks:
+                chunk = payloads.pop((path, i), None)
+                if chunk is None:
+                    with metrics.timer("serializer.read_seconds"):
+                        chunk = root[leaf_chunks[i][0]][()].tobytes()
+                    metrics.incr("serializer.bytes_read", len(chunk))
                 serialized_data.append(chunk)
                 i += 1
             concatenated_data = b''.join(serialized_data)
@@ -196,7 +313,9 @@ class ObjectSerializer:
                 decompressed_data = self.decompress_data(concatenated_data)
             except TypeError:
                 decompressed_data = concatenated_data
-            return dill.loads(decompressed_data)
+            metrics.incr("serializer.leaves_read")
+            with metrics.timer("serializer.unpickle_seconds"):
+                return dill.loads(decompressed_data)
 
     def repack(self, filename: str) -> None:
         """
@@ -0,0 +1,76 @@
+"""
+Measures how long it takes to import the slurmflow modules.
+
+Each import runs in a fresh interpreter, so nothing is already imported, and the
+heavy dependencies that the import pulled in are reported alongside its time.
+
+Usage:
+    python -m slurmflow.startup
+    python -m slurmflow.startup --repeat 10 --json
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from typing import Dict, List
+
+MODULES = ["slurmflow", "slurmflow.metrics", "slurmflow.config", "slurmflow.driver", "slurmflow.serializer"]
+HEAVY_MODULES = ["h5py", "blosc2", "dill", "numpy", "yaml"]
+
+_IMPORT_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(module: str, repeat: int = 3) -> Dict[str, object]:
+    """
+    Imports module in repeat fresh interpreters.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): The number of interpreters to start. The best time is reported.
+
+    Returns:
+        Dict[str, object]: 'seconds', the best import time, and 'heavy_modules', the heavy
+                           dependencies loaded by the import.
+    """
+    # Make this copy of slurmflow importable in the child, also when it is not installed
+    env = dict(os.environ)
+    source_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source_root, env.get("PYTHONPATH")]))
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+                                capture_output=True, text=True, check=True, env=env)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {"seconds": min(run["seconds"] for run in runs), "heavy_modules": runs[0]["heavy"]}
+
+
+def time_imports(modules: List[str] = MODULES, repeat: int = 3) -> Dict[str, Dict[str, object]]:
+    """Returns time_import(module, repeat) for each module."""
+    return {module: time_import(module, repeat) for module in modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=MODULES, help="Modules to import (default: all slurmflow modules).")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (best is reported).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+    results = time_imports(args.modules, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for module, result in results.items():
+        heavy = ", ".join(result["heavy_modules"]) or "none"
+        print(f"{module:<24} {result['seconds'] * 1000:8.1f} ms   heavy dependencies loaded: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import logging
+import subprocess
+
+import pytest
+
+# The fake Slurm binaries live in benchmarks/, next to the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slurmflow.driver import SlurmDriver
+from benchmarks import harness
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger():
+    logger = logging.getLogger("slurmflow")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    yield
+    logger.setLevel(level)
+
+
+@pytest.fixture
+def fake_slurm(tmp_path):
+    """Runs the test against the fake Slurm binaries, with their state in a temporary directory."""
+    def start(**env):
+        return harness.fake_slurm(str(tmp_path / "fake_slurm"), **env)
+    return start
+
+
+def _stubbed_driver(outputs: dict) -> SlurmDriver:
+    """
+    A driver whose Slurm commands return outputs[command]. An output can be a string (stdout),
+    a (returncode, stdout, stderr) tuple, or an exception to raise. Commands are recorded in driver.calls.
+    """
+    driver = SlurmDriver.__new__(SlurmDriver)
+    driver.verbose = False
+    driver.placement = None
+    driver.retry_policy = None
+    driver.accounting_enabled = True
+    driver.jobs_registry = {}
+    driver.calls = []
+
+    def run(cmd, **kwargs):
+        driver.calls.append(cmd)
+        output = outputs[cmd[0]]
+        if isinstance(output, Exception):
+            raise output
+        returncode, stdout, stderr = output if isinstance(output, tuple) else (0, output, "")
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    driver._run = run
+    return driver
+
+
+@pytest.fixture
+def stub_driver():
+    """Returns a factory for drivers with canned Slurm command output (see _stubbed_driver)."""
+    return _stubbed_driver
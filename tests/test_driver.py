@@ -0,0 +1,188 @@
+import os
+
+import pytest
+
+from slurmflow.driver import (SlurmDriver, RetryPolicy, TERMINAL_STATUSES, _status_from_state, _parse_time_seconds,
+                              _format_time)
+from benchmarks import harness
+
+DISABLED = (1, "", "sacct: error: Slurm accounting storage is disabled")
+DBD_DOWN = (1, "", "sacct: error: Problem talking to the database: Connection refused")
+
+
+@pytest.mark.parametrize("state, expected", [
+    ("COMPLETED", "completed"),
+    ("CANCELLED by 1234", "cancelled"),
+    ("CANCELLED+", "cancelled"),
+    ("OUT_OF_MEMORY", "out_of_memory"),
+    ("NODE_FAIL", "node_fail"),
+    ("TIMEOUT", "timeout"),
+    ("PREEMPTED", "preempted"),
+    ("REVOKED", "cancelled"),
+    ("SPECIAL_EXIT", "failed"),
+    ("PENDING", "pending"),
+    ("REQUEUED", "pending"),
+    ("SUSPENDED", "pending"),
+    ("RUNNING", "running"),
+    ("COMPLETING", "running"),
+    ("CONFIGURING", "running"),
+    ("", "completed"),
+])
+def test_status_from_state(state, expected):
+    assert _status_from_state(state) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("30", 30 * 60),
+    ("30:15", 30 * 60 + 15),
+    ("1:00:00", 3600),
+    ("2-00", 2 * 86400),
+    ("2-03", 2 * 86400 + 3 * 3600),
+    ("2-03:04", 2 * 86400 + 3 * 3600 + 4 * 60),
+    ("2-03:04:05", 2 * 86400 + 3 * 3600 + 4 * 60 + 5),
+    (120, 120 * 60),
+])
+def test_parse_time_seconds(value, expected):
+    assert _parse_time_seconds(value) == expected
+
+
+@pytest.mark.parametrize("value", ["UNLIMITED", "INFINITE", ""])
+def test_parse_time_seconds_rejects_unlimited(value):
+    with pytest.raises(ValueError):
+        _parse_time_seconds(value)
+
+
+@pytest.mark.parametrize("seconds", [0, 59, 3600, 86399, 86400, 3 * 86400 + 5])
+def test_format_time_round_trip(seconds):
+    assert _parse_time_seconds(_format_time(seconds)) == seconds
+
+
+@pytest.mark.parametrize("status, slurm_args, expected", [
+    ("out_of_memory", {"mem": "8G", "time": "1:00:00"}, {"mem": "16G", "time": "1:00:00"}),
+    ("out_of_memory", {"mem": "500M"}, {"mem": "1000M"}),
+    ("out_of_memory", {"mem": "600M"}, {"mem": "1200M"}),
+    ("out_of_memory", {}, {"mem": "16G"}),
+    ("timeout", {"time": "1:00:00"}, {"time": "2:00:00"}),
+    ("timeout", {"time": "23:00:00"}, {"time": "1-22:00:00"}),
+    ("timeout", {}, {"time": "2:00:00"}),
+    ("timeout", {"time": "UNLIMITED"}, {"time": "UNLIMITED"}),
+    ("preempted", {"mem": "8G", "time": "1:00:00"}, {"mem": "8G", "time": "1:00:00"}),
+    ("node_fail", {"mem": "8G"}, {"mem": "8G"}),
+])
+def test_retry_policy_adjust(status, slurm_args, expected):
+    original = dict(slurm_args)
+    assert RetryPolicy().adjust(status, slurm_args) == expected
+    assert slurm_args == original
+
+
+def test_retry_policy_caps():
+    capped = RetryPolicy(mem_factor=4, time_factor=4, max_mem="20G", max_time="1-00:00:00")
+    assert capped.adjust("out_of_memory", {"mem": "8G"})["mem"] == "20G"
+    assert capped.adjust("timeout", {"time": "12:00:00"})["time"] == "1-00:00:00"
+
+
+def test_retry_policy_should_retry():
+    policy = RetryPolicy()
+    assert policy.should_retry("timeout", {"retries": 2})
+    assert not policy.should_retry("timeout", {"retries": 3})
+    assert not policy.should_retry("failed", {"retries": 0})
+    assert not policy.should_retry("completed", {})
+
+
+def test_poll_statuses_takes_only_active_states_from_squeue(stub_driver):
+    # squeue -j also lists jobs that ended recently
+    driver = stub_driver({
+        "squeue": "101|TIMEOUT\n102|COMPLETED\n103|RUNNING\n104|PENDING\n105|COMPLETING\n",
+        "sacct": "101|TIMEOUT\n106|OUT_OF_MEMORY\n",
+    })
+    statuses = driver.poll_statuses(["101", "102", "103", "104", "105", "106", "107"])
+    assert statuses == {"101": "timeout", "102": "completed", "103": "running", "104": "pending",
+                        "105": "running", "106": "out_of_memory"}
+    assert ["sacct", "-X", "-n", "-P", "-j", "101,102,106,107", "-o", "JobID,State"] in driver.calls
+
+
+def test_poll_statuses_without_slurm(stub_driver):
+    driver = stub_driver({"squeue": FileNotFoundError("squeue"), "sacct": FileNotFoundError("sacct")})
+    assert driver.poll_statuses(["1", "2"]) == {"1": "completed", "2": "completed"}
+    driver.jobs_registry["1"] = {"status": "submitted"}
+    assert driver.check_job_status("1") == "completed"
+
+
+def test_poll_statuses_with_accounting_disabled(stub_driver):
+    driver = stub_driver({"squeue": "1|TIMEOUT\n", "sacct": DISABLED})
+    assert driver.poll_statuses(["1", "2"]) == {"1": "timeout", "2": "completed"}
+    assert not driver.accounting_enabled
+    # Detected once: sacct is not run again
+    driver.poll_statuses(["3"])
+    assert [call[0] for call in driver.calls].count("sacct") == 1
+
+
+def test_sacct_outage_leaves_jobs_unclassified(stub_driver):
+    outputs = {"squeue": "", "sacct": DBD_DOWN}
+    driver = stub_driver(outputs)
+    driver.retry_policy = RetryPolicy()
+    driver.jobs_registry["301"] = {"status": "running"}
+    driver.refresh_registry()
+    assert driver.jobs_registry["301"]["status"] == "running"
+    assert driver.accounting_enabled
+
+    outputs["sacct"] = "301|OUT_OF_MEMORY\n"
+    driver.resubmit_job = lambda job_id: driver.jobs_registry[job_id].setdefault("resubmitted_as", "302")
+    driver.refresh_registry()
+    assert driver.jobs_registry["301"]["status"] == "out_of_memory"
+    assert driver.jobs_registry["301"]["resubmitted_as"] == "302"
+
+
+def test_accounting_lag(stub_driver):
+    # Right after a job leaves the queue, sacct may have no record of it yet
+    outputs = {"squeue": "", "sacct": ""}
+    driver = stub_driver(outputs)
+    driver.jobs_registry["201"] = {"status": "running"}
+    assert driver.check_job_status("201") == "running"
+    driver.refresh_registry()
+    assert driver.jobs_registry["201"]["status"] == "running"
+    outputs["sacct"] = "201|TIMEOUT\n"
+    driver.refresh_registry()
+    assert driver.jobs_registry["201"]["status"] == "timeout"
+
+
+def test_wait_returns_at_once_for_empty_registry(stub_driver):
+    stub_driver({}).wait(sleep_time=3600)
+
+
+def test_retries_against_fake_slurm(fake_slurm, tmp_path):
+    fake = harness.fake_slurm_module()
+    with fake_slurm(runtime=0.2, failure_rate=1.0):
+        driver = SlurmDriver(retry_policy=RetryPolicy(max_retries=1))
+        log_dir = str(tmp_path / "logs")
+        checkpoint = tmp_path / "checkpoint.pt"
+        checkpoint.touch()
+        submitted = [driver.submit_job("true", slurm_args={"job_name": "check", "output_dir": log_dir, "mem": "1G"},
+                                       checkpoint=str(checkpoint))
+                     for _ in range(len(fake.FAILURE_STATES))]
+        driver.wait(sleep_time=0.5)
+
+    try:
+        for job_id in submitted:
+            job = driver.jobs_registry[job_id]
+            expected = _status_from_state(fake.final_state_for(int(job_id), 1.0))
+            assert job["status"] == expected
+            if expected not in RetryPolicy.DEFAULT_RETRY_STATES:
+                assert "resubmitted_as" not in job
+                continue
+            retry = driver.jobs_registry[job["resubmitted_as"]]
+            assert retry["parent"] == job_id and retry["retries"] == 1
+            assert retry["status"] in TERMINAL_STATUSES
+            assert retry["output"] == os.path.join(log_dir, f"slurm_check.retry1_{job['resubmitted_as']}.out")
+            # Retries are not retried again beyond max_retries
+            assert "resubmitted_as" not in retry
+            with open(retry["script"]) as file:
+                script = file.read()
+            assert f"export SLURMFLOW_PREVIOUS_JOB_ID={job_id}" in script
+            assert f"export SLURMFLOW_RESUME_FROM={checkpoint}" in script
+            assert "export SLURMFLOW_RETRY=1" in script
+            if expected == "out_of_memory":
+                assert "#SBATCH --mem=2G" in script
+    finally:
+        for job in driver.jobs_registry.values():
+            os.remove(job["script"])
@@ -0,0 +1,135 @@
+import os
+import logging
+
+import pytest
+
+from slurmflow.driver import SlurmDriver
+from slurmflow.follower import LogFollower
+
+
+@pytest.fixture
+def driver(stub_driver, tmp_path):
+    driver = stub_driver({"squeue": "", "scancel": ""})
+    for job_id in ("1", "2"):
+        driver.jobs_registry[job_id] = {"status": "running", "output": str(tmp_path / f"job{job_id}.out"),
+                                        "error": str(tmp_path / f"job{job_id}.err")}
+    return driver
+
+
+def append(path, data: bytes):
+    with open(path, "ab") as file:
+        file.write(data)
+
+
+def follower_for(driver, **kwargs):
+    return LogFollower(driver, use_inotify=False, **kwargs)
+
+
+def test_reads_only_appended_lines(driver):
+    follower = follower_for(driver, streams=("out",))
+    append(driver.jobs_registry["1"]["output"], b"a\nb\n")
+    append(driver.jobs_registry["2"]["output"], b"c\n")
+    assert follower.poll() == [("1", "out", "a"), ("1", "out", "b"), ("2", "out", "c")]
+    assert follower.poll() == []
+    append(driver.jobs_registry["1"]["output"], b"d\n")
+    assert follower.poll() == [("1", "out", "d")]
+
+
+def test_streams_are_tagged(driver):
+    follower = follower_for(driver, job_ids=["1"])
+    append(driver.jobs_registry["1"]["output"], b"out\n")
+    append(driver.jobs_registry["1"]["error"], b"err\n")
+    assert follower.poll() == [("1", "out", "out"), ("1", "err", "err")]
+
+
+def test_partial_line_is_held_until_newline(driver):
+    follower = follower_for(driver, job_ids=["1"], streams=("out",))
+    path = driver.jobs_registry["1"]["output"]
+    append(path, b"first\nsec")
+    assert follower.poll() == [("1", "out", "first")]
+    append(path, b"ond\nthi")
+    assert follower.poll() == [("1", "out", "second")]
+    assert follower.poll(final=True) == [("1", "out", "thi")]
+
+
+def test_truncated_file_is_read_from_the_start(driver):
+    follower = follower_for(driver, job_ids=["1"], streams=("out",))
+    path = driver.jobs_registry["1"]["output"]
+    append(path, b"old line\npartial")
+    assert follower.poll() == [("1", "out", "old line")]
+    with open(path, "wb") as file:
+        file.write(b"new\n")
+    # The held-back partial line belonged to the old contents and is dropped
+    assert follower.poll() == [("1", "out", "new")]
+
+
+def test_replaced_file_is_read_from_the_start(driver, tmp_path):
+    follower = follower_for(driver, job_ids=["1"], streams=("out",))
+    path = driver.jobs_registry["1"]["output"]
+    append(path, b"one\n")
+    assert follower.poll() == [("1", "out", "one")]
+    replacement = tmp_path / "replacement"
+    replacement.write_bytes(b"two\nthree\n")
+    os.replace(replacement, path)
+    assert follower.poll() == [("1", "out", "two"), ("1", "out", "three")]
+
+
+def test_error_line_cancels_only_its_job(driver):
+    follower = follower_for(driver, streams=("out",), error_patterns=[r"Traceback"], cancel_on_error=True)
+    append(driver.jobs_registry["1"]["output"], b"ok\nTraceback (most recent call last):\n")
+    append(driver.jobs_registry["2"]["output"], b"ok\n")
+    follower.poll()
+    assert follower.errors == {"1": ["Traceback (most recent call last):"]}
+    assert driver.calls == [["scancel", "1"]]
+    assert driver.jobs_registry["1"]["status"] == "cancelled"
+    assert driver.jobs_registry["2"]["status"] == "running"
+
+
+def test_shared_log_file_is_not_followed(driver, caplog):
+    shared = driver.jobs_registry["1"]["output"]
+    driver.jobs_registry["2"]["output"] = shared
+    append(shared, b"Traceback\n")
+    follower = follower_for(driver, streams=("out",), error_patterns=[r"Traceback"], cancel_on_error=True)
+    with caplog.at_level(logging.WARNING, logger="slurmflow"):
+        assert follower.poll() == []
+        follower.poll()
+    assert driver.calls == []
+    assert [r.message for r in caplog.records if "Not following" in r.message] == [
+        f"Not following {shared}: it is the log file of jobs 1, 2."
+    ]
+
+
+def test_follow_stops_when_jobs_leave_the_queue(driver):
+    append(driver.jobs_registry["1"]["output"], b"done\nno newline")
+    lines = list(follower_for(driver, streams=("out",)).follow(poll_interval=0, status_interval=0))
+    assert lines == [("1", "out", "done"), ("1", "out", "no newline")]
+    squeue = [call for call in driver.calls if call[0] == "squeue"]
+    assert len(squeue) == 1 and squeue[0][-2:] == ["-j", "1,2"]
+
+
+def test_follow_keeps_going_when_squeue_fails(stub_driver, tmp_path):
+    driver = stub_driver({"squeue": (1, "", "slurm_load_jobs error: Socket timed out on send/recv operation")})
+    driver.jobs_registry["1"] = {"status": "running", "output": str(tmp_path / "job1.out")}
+    lines = list(follower_for(driver, streams=("out",)).follow(poll_interval=0.01, status_interval=0, timeout=0.1))
+    assert lines == []
+    assert len([call for call in driver.calls if call[0] == "squeue"]) > 1
+
+
+def test_follow_stops_for_purged_job_ids(stub_driver, tmp_path):
+    driver = stub_driver({"squeue": (1, "", "slurm_load_jobs error: Invalid job id specified")})
+    driver.jobs_registry["1"] = {"status": "running", "output": str(tmp_path / "job1.out")}
+    assert list(follower_for(driver).follow(poll_interval=0, status_interval=0, timeout=5)) == []
+    assert len(driver.calls) == 1
+
+
+def test_submitted_jobs_get_separate_log_files(fake_slurm, tmp_path):
+    with fake_slurm():
+        driver = SlurmDriver()
+        job_ids = [driver.submit_job("true", slurm_args={"output_dir": str(tmp_path)}) for _ in range(2)]
+        for job_id in job_ids:
+            job = driver.jobs_registry[job_id]
+            assert job["output"] == str(tmp_path / f"slurm_python_job_{job_id}.out")
+            assert job["error"] == str(tmp_path / f"slurm_python_job_{job_id}.err")
+            with open(job["script"]) as file:
+                assert f"#SBATCH --output={tmp_path}/slurm_python_job_%j.out" in file.read()
+            os.remove(job["script"])
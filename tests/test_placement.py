@@ -0,0 +1,33 @@
+import pytest
+
+from slurmflow.driver import PartitionPlacement
+
+
+def test_snapshot_keeps_per_node_free_memory(stub_driver):
+    driver = stub_driver({"squeue": "", "sinfo": "a|up|0/10/0/10|1000\na|up|0/10/0/10|1000\nb|up|0/2/0/2|4000\n"})
+    snapshot = driver.partition_snapshot(["a", "b"])
+    assert snapshot["a"] == {"available": True, "idle_cpus": 20, "total_cpus": 20, "free_mem_mb": 1000.0, "pending": 0}
+    assert snapshot["b"]["free_mem_mb"] == 4000.0
+
+
+@pytest.mark.parametrize("slurm_args, expected", [
+    ({}, "big"),  # Submitted with the 8G default
+    ({"mem": "8G"}, "big"),
+    ({"mem": "1G"}, "small"),
+])
+def test_choose_fits_memory_request(stub_driver, slurm_args, expected):
+    driver = stub_driver({"squeue": "", "sinfo": "small|up|0/64/0/64|2000\nbig|up|0/8/0/8|16000\n"})
+    assert PartitionPlacement(["small", "big"]).choose(driver, slurm_args) == expected
+
+
+def test_least_loaded_spreads_a_burst(stub_driver):
+    driver = stub_driver({"sinfo": "a|up|0/4/0/4|64000\nb|up|0/2/0/2|64000\n", "squeue": "a\n"})
+    placement = PartitionPlacement(["a", "b"])
+    # a has 4 idle CPUs and 1 pending job, b has 2 idle CPUs. Ties go to the earlier candidate.
+    assert [placement.choose(driver, {"mem": "1G"}) for _ in range(4)] == ["a", "a", "b", "a"]
+
+
+def test_multi_lists_all_partitions(stub_driver):
+    driver = stub_driver({"squeue": "", "sinfo": "a|up|0/4/0/4|64000\nb|up|0/8/0/8|64000\nc|down|0/8/0/8|64000\n"})
+    placement = PartitionPlacement(["a", "b", "c"], strategy="multi")
+    assert placement.choose(driver, {"mem": "1G"}) == "b,a"
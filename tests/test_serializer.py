@@ -0,0 +1,98 @@
+import sys
+import importlib
+
+import numpy as np
+import pytest
+
+from slurmflow import serializer
+from slurmflow.serializer import ObjectSerializer
+
+
+class Node:
+    pass
+
+
+def make_graph():
+    root = Node()
+    root.values = np.arange(100)
+    root.name = "root"
+    root.child = Node()
+    root.child.items = list(range(50))
+    root.child.grandchild = Node()
+    root.child.grandchild.flag = True
+    root.big = np.random.default_rng(0).random(300_000)  # Stored above SMALL_LEAF_BYTES
+    return root
+
+
+def assert_graph_equal(loaded, original):
+    assert isinstance(loaded, Node)
+    assert (loaded.values == original.values).all()
+    assert loaded.name == original.name
+    assert loaded.child.items == original.child.items
+    assert loaded.child.grandchild.flag is True
+    assert (loaded.big == original.big).all()
+
+
+@pytest.fixture
+def stored(tmp_path):
+    graph = make_graph()
+    filename = str(tmp_path / "graph.h5")
+    ObjectSerializer().save(graph, filename)
+    return graph, filename
+
+
+def test_round_trip(stored):
+    graph, filename = stored
+    assert_graph_equal(ObjectSerializer().load(filename), graph)
+
+
+@pytest.mark.parametrize("prefetch_bytes", [0, 100, 1 << 30])
+def test_round_trip_with_prefetch_limit(stored, monkeypatch, prefetch_bytes):
+    graph, filename = stored
+    monkeypatch.setattr(serializer, "PREFETCH_BYTES", prefetch_bytes)
+    assert_graph_equal(ObjectSerializer().load(filename), graph)
+
+
+def test_prefetch_stays_within_limit(stored, monkeypatch):
+    _, filename = stored
+    s = ObjectSerializer()
+    with serializer.h5py.File(filename, "r") as hdf_file:
+        root = hdf_file["/"]
+        _, _, chunks = s._index_tree(root)
+        assert len(s._read_small_leaves(root, chunks)) == 4  # values, name, items, flag; not big
+        monkeypatch.setattr(serializer, "PREFETCH_BYTES", 0)
+        assert s._read_small_leaves(root, chunks) == {}
+
+
+def test_load_subpath(stored):
+    graph, filename = stored
+    child = ObjectSerializer().load(filename, "child")
+    assert child.items == graph.child.items
+    assert child.grandchild.flag is True
+    assert ObjectSerializer().load(filename, "child/items") == graph.child.items
+
+
+def test_missing_path(stored):
+    _, filename = stored
+    with pytest.raises(ValueError):
+        ObjectSerializer().load(filename, "nope")
+
+
+def test_load_uses_reloaded_class(tmp_path, monkeypatch):
+    module_file = tmp_path / "reloaded_types.py"
+    module_file.write_text("class Widget:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("reloaded_types")
+    try:
+        widget = module.Widget()
+        widget.size = 3
+        filename = str(tmp_path / "widget.h5")
+        ObjectSerializer().save(widget, filename)
+        assert isinstance(ObjectSerializer().load(filename), module.Widget)
+
+        module = importlib.reload(module)
+        loaded = ObjectSerializer().load(filename)
+        assert isinstance(loaded, module.Widget)
+        assert loaded.size == 3
+    finally:
+        sys.modules.pop("reloaded_types", None)